@@ -0,0 +1,147 @@
+# benchmarks/startup_benchmark.py
+"""
+Startup benchmark for the prediction API
+
+Measures, in fresh interpreter processes:
+  - import time of src.api.main and which heavy modules it pulled in
+  - time until /health/live answers
+  - time until /health/ready reports every stage ready
+  - time to the first successful /predict response
+
+Usage:
+    python benchmarks/startup_benchmark.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MODEL_NAME = "benchmark_model"
+HEAVY_MODULES = ["pandas", "scipy", "mlflow", "numpy"]
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import src.api.main
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "import_s": elapsed,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+FIRST_PREDICTION_PROBE = """
+import json, time
+start = time.perf_counter()
+import src.api.main as main
+from fastapi.testclient import TestClient
+
+result = {"import_s": time.perf_counter() - start}
+with TestClient(main.app) as client:
+    client.get("/health/live")
+    result["live_s"] = time.perf_counter() - start
+    deadline = start + %(timeout)f
+    while time.perf_counter() < deadline:
+        if client.get("/health/ready").status_code == 200:
+            break
+        time.sleep(0.005)
+    result["ready_s"] = time.perf_counter() - start
+    response = client.post("/predict", json={"features": %(features)r})
+    result["first_prediction_s"] = time.perf_counter() - start
+    result["status_code"] = response.status_code
+    result["stages"] = main.startup_state.snapshot()
+print(json.dumps(result))
+"""
+
+
+def prepare_workdir(workdir, tracking_uri):
+    """Write a schema, reference data and a registered model for the API to load"""
+    import numpy as np
+    import pandas as pd
+
+    model_dir = os.path.join(workdir, "models", MODEL_NAME)
+    os.makedirs(model_dir, exist_ok=True)
+
+    schema = {
+        "features": {
+            "feature1": {"type": "numeric", "required": True, "range": [-10, 10]},
+            "feature2": {"type": "numeric", "required": True, "range": [-10, 10]},
+            "feature3": {"type": "categorical", "required": False},
+        }
+    }
+    with open(os.path.join(model_dir, "schema.json"), "w") as f:
+        json.dump(schema, f)
+
+    rng = np.random.default_rng(0)
+    n_rows = 100_000
+    pd.DataFrame({
+        "feature1": rng.normal(0, 1, n_rows),
+        "feature2": rng.normal(1, 0.5, n_rows),
+        "feature3": rng.choice(["category_a", "category_b"], n_rows),
+    }).to_csv(os.path.join(model_dir, "reference_data.csv"), index=False)
+
+    from mlflow.tracking import MlflowClient
+    client = MlflowClient(tracking_uri)
+    client.create_registered_model(MODEL_NAME)
+    version = client.create_model_version(MODEL_NAME, source=model_dir)
+    client.transition_model_version_stage(MODEL_NAME, version.version, "Production")
+
+
+def run_probe(code, workdir, env):
+    """Run a probe script in a fresh interpreter and parse its JSON output"""
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=workdir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(name, values):
+    print(f"{name:<22} median={statistics.median(values) * 1000:8.1f} ms  "
+          f"min={min(values) * 1000:8.1f} ms  max={max(values) * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts to measure")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for readiness")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        tracking_uri = f"sqlite:///{os.path.join(workdir, 'mlflow.db')}"
+        prepare_workdir(workdir, tracking_uri)
+
+        env = dict(os.environ)
+        env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+        env["MODEL_NAME"] = MODEL_NAME
+        env["MLFLOW_TRACKING_URI"] = tracking_uri
+
+        imports = [run_probe(IMPORT_PROBE, workdir, env) for _ in range(args.runs)]
+        probe = FIRST_PREDICTION_PROBE % {
+            "timeout": args.timeout,
+            "features": {"feature1": 0.5, "feature2": 1.0, "feature3": "category_a"},
+        }
+        cold_starts = [run_probe(probe, workdir, env) for _ in range(args.runs)]
+
+    print(f"Heavy modules loaded at import: {imports[0]['loaded'] or 'none'}")
+    summarize("import src.api.main", [r["import_s"] for r in imports])
+    summarize("liveness", [r["live_s"] for r in cold_starts])
+    summarize("readiness", [r["ready_s"] for r in cold_starts])
+    summarize("first prediction", [r["first_prediction_s"] for r in cold_starts])
+    print(f"First prediction status codes: {sorted({r['status_code'] for r in cold_starts})}")
+    for name, info in cold_starts[-1]["stages"].items():
+        duration = info.get("duration_ms")
+        duration = f"{duration:8.1f} ms" if duration is not None else "       n/a"
+        print(f"  stage {name:<16} {info['status']:<8} {duration}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# src/api/admission.py
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Optional
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted"""
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Adaptive concurrency limit with a bounded wait queue
+
+    The limit follows AIMD on observed latency: it grows by about one per
+    limit's worth of completions while latency stays under the target and the
+    limit is actually being used, and is cut multiplicatively (at most once
+    per observed latency period) when latency exceeds the target.
+
+    Requests over the limit wait in a FIFO queue. When the queue is full they
+    are rejected immediately (429), and when they wait longer than
+    queue_timeout they are rejected (503), both with a Retry-After estimate.
+    Must be used from a single event loop.
+    """
+    def __init__(self, initial_limit: int = 32, min_limit: int = 1, max_limit: int = 512,
+                 max_queue: int = 64, queue_timeout: float = 1.0,
+                 latency_target: float = 0.25, backoff: float = 0.9, smoothing: float = 0.1):
+        """
+        Args:
+            initial_limit: Starting concurrency limit
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            max_queue: Maximum number of requests waiting for a slot
+            queue_timeout: Maximum seconds a request waits for a slot
+            latency_target: Latency in seconds above which the limit is reduced
+            backoff: Multiplicative decrease factor
+            smoothing: Weight of new samples in the latency moving average
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.avg_latency = 0.0
+        self._waiters = deque()
+        self._last_decrease = 0.0
+
+    @property
+    def current_limit(self) -> int:
+        return max(int(self.limit), self.min_limit)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait, estimated from queue drain time"""
+        drain_time = (self.queue_depth + 1) * self.avg_latency / self.current_limit
+        return max(int(math.ceil(drain_time)), 1)
+
+    async def acquire(self):
+        """Wait for a slot, raising AdmissionRejected if the request is shed"""
+        if self.in_flight < self.current_limit and not self._waiters:
+            self.in_flight += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            raise AdmissionRejected(429, "queue_full", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            raise AdmissionRejected(503, "queue_timeout", self.retry_after())
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+
+    def _abandon(self, waiter: asyncio.Future):
+        """Give up waiting, handing on the slot if it was granted meanwhile"""
+        if waiter.done() and not waiter.cancelled():
+            self.in_flight -= 1
+            self._wake_waiters()
+        else:
+            waiter.cancel()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self, latency: Optional[float] = None):
+        """Free a slot and adapt the limit to the observed latency"""
+        saturated = self.in_flight >= self.current_limit or bool(self._waiters)
+        self.in_flight -= 1
+        if latency is not None:
+            self._observe(latency, saturated)
+        self._wake_waiters()
+
+    def _observe(self, latency: float, saturated: bool):
+        if self.avg_latency == 0.0:
+            self.avg_latency = latency
+        else:
+            self.avg_latency += self.smoothing * (latency - self.avg_latency)
+
+        if latency > self.latency_target:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.avg_latency:
+                self.limit = max(self.limit * self.backoff, float(self.min_limit))
+                self._last_decrease = now
+        elif saturated:
+            self.limit = min(self.limit + 1.0 / self.limit, float(self.max_limit))
+
+    def _wake_waiters(self):
+        while self._waiters and self.in_flight < self.current_limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
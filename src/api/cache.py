@@ -0,0 +1,121 @@
+# src/api/cache.py
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Rough per-entry bookkeeping overhead (OrderedDict node, tuple, floats)
+ENTRY_OVERHEAD_BYTES = 200
+
+
+class PredictionCache:
+    """
+    LRU cache of prediction results
+
+    Entries are keyed by a canonical hash of the request features together
+    with the model name and version, and bounded by entry count and by an
+    estimate of their memory use. When the cache is used with a different
+    model version than before, all entries are dropped.
+    """
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: Optional[float] = None, metrics=None):
+        """
+        Args:
+            max_entries: Maximum number of cached predictions
+            max_bytes: Maximum estimated memory used by cached entries
+            ttl: Seconds after which an entry expires, None to never expire
+            metrics: Optional MLMetricsCollector for hit/miss/eviction counts
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.metrics = metrics
+        self.model_version: Optional[str] = None
+        self.size_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(features: Dict[str, Any], model_name: str, model_version: str) -> str:
+        """Canonical hash of the features for a model version"""
+        payload = json.dumps(
+            [model_name, str(model_version), features],
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _track(self, event: str, count: int = 1):
+        if self.metrics is not None and count:
+            self.metrics.track_cache_event(event, count)
+
+    def _check_version(self, model_version: str):
+        """Drop every entry if the served model version changed"""
+        if self.model_version != model_version:
+            evicted = len(self._entries)
+            self._entries.clear()
+            self.size_bytes = 0
+            self.model_version = model_version
+            self._track("invalidation", evicted)
+
+    def get(self, features: Dict[str, Any], model_name: str, model_version: str) -> Optional[Any]:
+        """Return the cached result or None"""
+        key = self.make_key(features, model_name, model_version)
+        with self._lock:
+            self._check_version(model_version)
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.time() - entry[1] > self.ttl:
+                self._remove(key)
+                self._track("expired")
+                entry = None
+            if entry is None:
+                self._track("miss")
+                return None
+            self._entries.move_to_end(key)
+        self._track("hit")
+        return entry[0]
+
+    def put(self, features: Dict[str, Any], model_name: str, model_version: str, value: Any):
+        """Cache a result, evicting least recently used entries as needed"""
+        key = self.make_key(features, model_name, model_version)
+        size = self._estimate_size(key, value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._check_version(model_version)
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.time(), size)
+            self.size_bytes += size
+
+            evicted = 0
+            while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                evicted += 1
+        self._track("eviction", evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self.size_bytes -= size
+
+    @staticmethod
+    def _estimate_size(key: str, value: Any) -> int:
+        return (
+            sys.getsizeof(key)
+            + len(json.dumps(value, default=str))
+            + ENTRY_OVERHEAD_BYTES
+        )
@@ -1,22 +1,54 @@
 # src/api/main.py
-from fastapi import FastAPI, Request, Depends, HTTPException
+from fastapi import FastAPI, Request, Depends, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel, Field
+from contextlib import aclosing
 from typing import Dict, List, Any, Optional
-import pandas as pd
+import ipaddress
 import json
 import os
+import tempfile
 import time
 
+# Heavy modules (pandas, scipy, mlflow) are imported lazily by the startup
+# loaders below so that importing this module stays cheap
 from src.monitoring.metrics import MLMetricsCollector
-from src.data_validation.schema import DataSchemaValidator
-from src.data_validation.drift import DriftDetector
-from src.model_registry.client import ModelRegistry
-from src.api.middleware import metrics_middleware
+from src.monitoring.tracing import traced, tracer
+from src.api.middleware import metrics_middleware, admission_middleware
+from src.api.admission import AdmissionController
+from src.api.startup import StartupState
+from src.api.cache import PredictionCache
+from src.api.stream import DuplexStreamingResponse, ndjson_records, record_too_large, stream_batches
 
 # Load model from registry
 MODEL_NAME = os.getenv("MODEL_NAME", "example_model")
 MODEL_VERSION = os.getenv("MODEL_VERSION", "1")
+MLFLOW_TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5000")
+DRIFT_WINDOW_SIZE = int(os.getenv("DRIFT_WINDOW_SIZE", "1000"))
+SHARED_PROFILE_DIR = os.getenv("SHARED_PROFILE_DIR")  # Defaults to /dev/shm
+DRIFT_SEGMENT_COLUMNS = [col for col in os.getenv("DRIFT_SEGMENT_COLUMNS", "").split(",") if col]
+METRICS_MAX_SERIES = int(os.getenv("METRICS_MAX_SERIES", "1000"))
+PREDICTION_CACHE_ENABLED = os.getenv("PREDICTION_CACHE_ENABLED", "false").lower() == "true"
+PREDICTION_CACHE_MAX_ENTRIES = int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "10000"))
+PREDICTION_CACHE_MAX_BYTES = int(os.getenv("PREDICTION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "0")) or None
+ADMISSION_CONTROL_ENABLED = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+ADMISSION_INITIAL_LIMIT = int(os.getenv("ADMISSION_INITIAL_LIMIT", "32"))
+ADMISSION_MAX_LIMIT = int(os.getenv("ADMISSION_MAX_LIMIT", "512"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "1.0"))
+ADMISSION_LATENCY_TARGET = float(os.getenv("ADMISSION_LATENCY_TARGET", "0.25"))
+STREAM_MAX_BATCH = int(os.getenv("STREAM_MAX_BATCH", "64"))
+STREAM_MAX_PENDING = int(os.getenv("STREAM_MAX_PENDING", "256"))
+STREAM_MAX_RECORD_BYTES = int(os.getenv("STREAM_MAX_RECORD_BYTES", str(1024 * 1024)))
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+TRACE_SLOW_THRESHOLD = float(os.getenv("TRACE_SLOW_THRESHOLD", "0.5"))
+TRACE_TAIL_SAMPLING = os.getenv("TRACE_TAIL_SAMPLING", "true").lower() == "true"
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "1000"))
+TRACE_EXPORT_ENABLED = os.getenv("TRACE_EXPORT_ENABLED", "false").lower() == "true"
 
 # Initialize the app
 app = FastAPI(
@@ -34,13 +66,44 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Add admission control for prediction endpoints (inside the metrics
+# middleware so shed requests are counted)
+admission_controller = AdmissionController(
+    initial_limit=ADMISSION_INITIAL_LIMIT,
+    max_limit=ADMISSION_MAX_LIMIT,
+    max_queue=ADMISSION_MAX_QUEUE,
+    queue_timeout=ADMISSION_QUEUE_TIMEOUT,
+    latency_target=ADMISSION_LATENCY_TARGET
+)
+if ADMISSION_CONTROL_ENABLED:
+    app.middleware("http")(
+        admission_middleware(admission_controller, ("/predict", "/predict/batch"))
+    )
+
 # Add metrics middleware
 app.middleware("http")(metrics_middleware)
 
 # Initialize components
-metrics = MLMetricsCollector(MODEL_NAME, MODEL_VERSION)
-registry = ModelRegistry()
+tracer.configure(
+    enabled=TRACING_ENABLED,
+    sample_rate=TRACE_SAMPLE_RATE,
+    slow_threshold=TRACE_SLOW_THRESHOLD,
+    capacity=TRACE_BUFFER_SIZE,
+    tail_sampling=TRACE_TAIL_SAMPLING
+)
+metrics = MLMetricsCollector(MODEL_NAME, MODEL_VERSION, max_series_per_metric=METRICS_MAX_SERIES)
+registry = None  # Created in the background on startup
 model = None  # Will be loaded on startup
+validator = None
+drift_detector = None
+drift_window = None  # Sliding window of recent requests used for drift
+startup_state = StartupState(["model", "validator", "drift_detector"])
+prediction_cache = PredictionCache(
+    max_entries=PREDICTION_CACHE_MAX_ENTRIES,
+    max_bytes=PREDICTION_CACHE_MAX_BYTES,
+    ttl=PREDICTION_CACHE_TTL,
+    metrics=metrics
+) if PREDICTION_CACHE_ENABLED else None
 
 # Pydantic models for requests/responses
 class PredictionRequest(BaseModel):
@@ -54,49 +117,239 @@ class PredictionResponse(BaseModel):
     model_version: str = Field(..., description="Model version used")
     processing_time_ms: float = Field(..., description="Processing time in milliseconds")
 
+class BatchPredictionRequest(BaseModel):
+    records: List[Dict[str, Any]] = Field(..., description="Feature values for each record")
+    request_id: Optional[str] = Field(None, description="Unique request ID")
+
+class BatchPrediction(BaseModel):
+    prediction: Any = Field(..., description="Model prediction")
+    prediction_probability: Optional[float] = Field(None, description="Prediction probability")
+
+class RejectedRecord(BaseModel):
+    row: int = Field(..., description="Position of the record in the batch")
+    errors: Dict[str, List[str]] = Field(..., description="Validation errors per feature")
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[Optional[BatchPrediction]] = Field(
+        ..., description="Prediction for each record, null for rejected records"
+    )
+    rejected: List[RejectedRecord] = Field(..., description="Records that failed validation")
+    request_id: Optional[str] = Field(None, description="Original request ID")
+    model_version: str = Field(..., description="Model version used")
+    processing_time_ms: float = Field(..., description="Processing time in milliseconds")
+
+def load_model():
+    """Connect to the registry and load the model"""
+    global registry, model
+    from src.model_registry.client import ModelRegistry
+    
+    registry = ModelRegistry(tracking_uri=MLFLOW_TRACKING_URI)
+    model_info = registry.get_latest_model(MODEL_NAME)
+    if not model_info:
+        raise ValueError(f"Model {MODEL_NAME} not found in registry")
+    
+    # TODO: Load actual model here
+    model = "placeholder"  # Will be replaced with actual model loading
+
+def load_validator():
+    """Load the data schema"""
+    global validator
+    from src.data_validation.schema import DataSchemaValidator
+    
+    schema_path = f"models/{MODEL_NAME}/schema.json"
+    validator = DataSchemaValidator(schema_path=schema_path)
+    
+    # Only schema features may create feature-level metric series
+    metrics.set_feature_allowlist(validator.schema["features"].keys())
+
+def load_drift_detector():
+    """
+    Load the reference profile and build the drift detector
+    
+    Uses the local profile if present, otherwise downloads the profile stored
+    with the model in the registry (caching it locally). Falls back to
+    building a profile from the reference CSV once per node, shared by all
+    workers.
+    """
+    global drift_detector, drift_window
+    from src.data_validation.drift import DriftDetector
+    from src.data_validation.profile import PROFILE_FILENAME
+    from src.data_validation.shared import attach_shared_profile
+    
+    model_dir = f"models/{MODEL_NAME}"
+    profile_path = os.path.join(model_dir, PROFILE_FILENAME)
+    
+    if not os.path.exists(profile_path):
+        try:
+            from src.model_registry.client import ModelRegistry
+            
+            os.makedirs(model_dir, exist_ok=True)
+            with tempfile.TemporaryDirectory(dir=model_dir) as download_dir:
+                downloaded = ModelRegistry(
+                    tracking_uri=MLFLOW_TRACKING_URI
+                ).download_reference_profile(
+                    MODEL_NAME, MODEL_VERSION, download_dir, filename=PROFILE_FILENAME
+                )
+                os.replace(downloaded, profile_path)
+        except Exception as e:
+            print(f"Reference profile not available from registry: {str(e)}")
+    
+    # Workers map the same read-only profile, so the reference data is held
+    # once per node rather than once per worker
+    detector = DriftDetector(profile=attach_shared_profile(
+        f"{MODEL_NAME}-{MODEL_VERSION}",
+        profile_path=profile_path,
+        reference_csv=os.path.join(model_dir, "reference_data.csv"),
+        shared_dir=SHARED_PROFILE_DIR,
+        segment_columns=DRIFT_SEGMENT_COLUMNS
+    ))
+    
+    window = detector.create_window(max_size=DRIFT_WINDOW_SIZE)
+    drift_window, drift_detector = window, detector
+    
+    # Drift is evaluated when Prometheus scrapes, not per request
+    metrics.set_drift_source(lambda: detector.detect_drift_window(window))
+
 @app.on_event("startup")
 async def startup_event():
-    """Load model on startup"""
-    global model, validator, drift_detector
+    """
+    Start loading components in the background
     
+    The registry, schema and reference data are loaded in parallel so the
+    server answers liveness probes immediately. Errors are recorded per stage
+    and reported by /health/ready instead of preventing the app from starting.
+    """
+    startup_state.start({
+        "model": load_model,
+        "validator": load_validator,
+        "drift_detector": load_drift_detector,
+    })
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus metrics endpoint"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+def is_loopback(host: Optional[str]) -> bool:
     try:
-        # Load the model from registry
-        model_info = registry.get_latest_model(MODEL_NAME)
-        if not model_info:
-            raise ValueError(f"Model {MODEL_NAME} not found in registry")
-        
-        # TODO: Load actual model here
-        model = "placeholder"  # Will be replaced with actual model loading
-        
-        # Load schema and reference data
-        schema_path = f"models/{MODEL_NAME}/schema.json"
-        reference_data_path = f"models/{MODEL_NAME}/reference_data.csv"
-        
-        validator = DataSchemaValidator(schema_path=schema_path)
-        drift_detector = DriftDetector(pd.read_csv(reference_data_path))
-        
-    except Exception as e:
-        # Log the error but allow the app to start
-        print(f"Error loading model: {str(e)}")
+        return host is not None and ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+@app.get("/debug/traces")
+async def debug_traces(request: Request, limit: int = 100, min_duration_ms: float = 0.0):
+    """
+    Recent sampled, slow and failed request traces, newest first
+    
+    Only served when TRACE_EXPORT_ENABLED is set, and only to clients on
+    the loopback interface.
+    """
+    if not TRACE_EXPORT_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_loopback(request.client.host if request.client else None):
+        raise HTTPException(status_code=403, detail="Trace export is only available locally")
+    return {
+        "sample_rate": tracer.sample_rate,
+        "slow_threshold_ms": tracer.slow_threshold * 1000,
+        "capacity": tracer.capacity,
+        "traces": tracer.traces(limit=limit, min_duration_ms=min_duration_ms)
+    }
 
 @app.get("/health")
 async def health():
-    """Health check endpoint"""
+    """Health check endpoint with liveness and per-stage readiness"""
+    ready = startup_state.is_ready()
+    response = {
+        "status": "ok" if ready else "warning",
+        "live": True,
+        "ready": ready,
+        "stages": startup_state.snapshot()
+    }
     if model is None:
-        return {"status": "warning", "message": "Model not loaded"}
+        response["message"] = "Model not loaded"
+    return response
+
+@app.get("/health/live")
+async def health_live():
+    """Liveness probe, succeeds as soon as the server is accepting requests"""
     return {"status": "ok"}
 
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness probe, succeeds only once every component has loaded"""
+    ready = startup_state.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "stages": startup_state.snapshot()}
+    )
+
+def check_ready():
+    """Raise 503 unless the model and data components are loaded"""
+    if model is None:
+        metrics.track_error("model_not_loaded")
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    
+    if validator is None or drift_detector is None:
+        metrics.track_error("not_ready")
+        raise HTTPException(status_code=503, detail="Service not ready")
+
+@traced("score_records")
+def score_records(records: List[Dict[str, Any]]) -> List[tuple]:
+    """
+    Monitor and score records that have passed validation
+    
+    Returns:
+        List of (prediction, probability), one per record
+    """
+    # Track feature values for monitoring
+    for features in records:
+        for feature, value in features.items():
+            if isinstance(value, (int, float)):
+                metrics.track_feature_value(feature, value)
+    
+    # Add to the drift window, drift itself is evaluated at scrape time
+    for features in records:
+        drift_window.add(features)
+    
+    # TODO: Make actual prediction with the model
+    # For now, we'll just return a mock response
+    with tracer.span("model.predict", rows=len(records)):
+        results = [(1, 0.85) for _ in records]  # Placeholder
+    
+    # Track successful predictions
+    for _ in records:
+        metrics.track_prediction("success")
+    
+    return results
+
 @app.post("/predict", response_model=PredictionResponse)
 @metrics.track_latency()
+@traced("predict")
 async def predict(request: PredictionRequest):
     """Make a prediction with the model"""
     start_time = time.time()
+    check_ready()
     
-    if model is None:
-        metrics.track_error("model_not_loaded")
-        raise HTTPException(status_code=503, detail="Model not loaded")
+    import pandas as pd
     
     try:
+        # Repeated feature vectors (retries, polling) skip validation,
+        # drift and inference
+        cached = None
+        if prediction_cache is not None:
+            with tracer.span("cache.get"):
+                cached = prediction_cache.get(request.features, MODEL_NAME, MODEL_VERSION)
+        if cached is not None:
+            metrics.track_prediction("success")
+            prediction, probability = cached
+            return PredictionResponse(
+                prediction=prediction,
+                prediction_probability=probability,
+                request_id=request.request_id,
+                model_version=MODEL_VERSION,
+                processing_time_ms=(time.time() - start_time) * 1000
+            )
+        
         # Convert features to DataFrame for validation
         features_df = pd.DataFrame([request.features])
         
@@ -109,28 +362,11 @@ async def predict(request: PredictionRequest):
                 detail=f"Validation error: {validation_result['errors']}"
             )
         
-        # Track feature values for monitoring
-        for feature, value in request.features.items():
-            if isinstance(value, (int, float)):
-                metrics.track_feature_value(feature, value)
-        
-        # Check for drift (in real system, this would be batched)
-        drift_result = drift_detector.detect_drift(features_df)
-        for feature, drift_info in drift_result["feature_drifts"].items():
-            if "statistic" in drift_info:
-                metrics.track_drift_score(
-                    feature, 
-                    drift_info["statistic"],
-                    drift_info.get("test", "unknown")
-                )
-        
-        # TODO: Make actual prediction with the model
-        # For now, we'll just return a mock response
-        prediction = 1  # Placeholder
-        probability = 0.85  # Placeholder
-        
-        # Track successful prediction
-        metrics.track_prediction("success")
+        prediction, probability = score_records([request.features])[0]
+        if prediction_cache is not None:
+            prediction_cache.put(
+                request.features, MODEL_NAME, MODEL_VERSION, (prediction, probability)
+            )
         
         # Calculate processing time
         processing_time = (time.time() - start_time) * 1000  # ms
@@ -147,3 +383,166 @@ async def predict(request: PredictionRequest):
         # Track error
         metrics.track_error("prediction_error")
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+@metrics.track_latency()
+@traced("predict_batch")
+async def predict_batch(request: BatchPredictionRequest):
+    """
+    Make predictions for a batch of records
+    
+    Rows are validated individually: valid rows are scored and invalid rows
+    are reported in `rejected` instead of failing the whole batch.
+    """
+    start_time = time.time()
+    check_ready()
+    
+    import pandas as pd
+    
+    try:
+        features_df = pd.DataFrame(request.records)
+        validation_result = validator.validate_rows(features_df)
+        
+        predictions: List[Optional[BatchPrediction]] = [None] * len(request.records)
+        valid_positions = [int(i) for i in validation_result.valid_mask.nonzero()[0]]
+        scores = score_records([request.records[i] for i in valid_positions])
+        for position, (prediction, probability) in zip(valid_positions, scores):
+            predictions[position] = BatchPrediction(
+                prediction=prediction,
+                prediction_probability=probability
+            )
+        
+        rejected = validation_result.report()
+        for _ in rejected:
+            metrics.track_error("validation_error")
+        
+        return BatchPredictionResponse(
+            predictions=predictions,
+            rejected=rejected,
+            request_id=request.request_id,
+            model_version=MODEL_VERSION,
+            processing_time_ms=(time.time() - start_time) * 1000
+        )
+    
+    except Exception as e:
+        metrics.track_error("prediction_error")
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+@traced("predict_stream_batch")
+def predict_stream_batch(items: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Validate and score a micro-batch of streamed records
+    
+    Each item is {"features": {...}, "request_id": ...}. Returns one result
+    per item, in order: a prediction or an error.
+    """
+    import pandas as pd
+    
+    results: List[Dict[str, Any]] = [None] * len(items)
+    records, positions = [], []
+    for position, item in enumerate(items):
+        request_id = item.get("request_id") if isinstance(item, dict) else None
+        if not isinstance(item, dict) or "error" in item:
+            results[position] = {
+                "request_id": request_id,
+                "error": item.get("error") if isinstance(item, dict) else "Record must be an object"
+            }
+        elif not isinstance(item.get("features"), dict):
+            results[position] = {"request_id": request_id, "error": "Missing features"}
+        else:
+            records.append(item["features"])
+            positions.append(position)
+    
+    if records:
+        validation_result = validator.validate_rows(pd.DataFrame(records))
+        for rejected in validation_result.report():
+            position = positions[rejected["row"]]
+            metrics.track_error("validation_error")
+            results[position] = {
+                "request_id": items[position].get("request_id"),
+                "error": {"validation": rejected["errors"]}
+            }
+        
+        valid_rows = [int(i) for i in validation_result.valid_mask.nonzero()[0]]
+        scores = score_records([records[row] for row in valid_rows])
+        for row, (prediction, probability) in zip(valid_rows, scores):
+            position = positions[row]
+            results[position] = {
+                "request_id": items[position].get("request_id"),
+                "prediction": prediction,
+                "prediction_probability": probability,
+                "model_version": MODEL_VERSION
+            }
+    
+    return results
+
+@app.post("/predict/stream")
+async def predict_stream(request: Request):
+    """
+    Stream predictions over a chunked NDJSON request
+    
+    Each request line is a record ({"features": {...}, "request_id": ...}),
+    and each response line is the prediction or error for the matching
+    record, in order.
+    """
+    check_ready()
+    results = stream_batches(
+        ndjson_records(request.stream(), max_record_bytes=STREAM_MAX_RECORD_BYTES),
+        predict_stream_batch,
+        max_batch=STREAM_MAX_BATCH,
+        max_pending=STREAM_MAX_PENDING
+    )
+    
+    async def lines():
+        # Closing the results stops the reader even if the client went away
+        async with aclosing(results):
+            async for result in results:
+                yield json.dumps(result, default=str) + "\n"
+    
+    return DuplexStreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.websocket("/predict/stream")
+async def predict_stream_ws(websocket: WebSocket):
+    """
+    Stream predictions over a WebSocket
+    
+    Each text message is one record, and one result message is sent per
+    record, in order.
+    """
+    await websocket.accept()
+    if model is None or validator is None or drift_detector is None:
+        await websocket.close(code=1013, reason="Service not ready")
+        return
+    
+    async def records():
+        while True:
+            try:
+                message = await websocket.receive_text()
+            except WebSocketDisconnect:
+                return
+            if len(message) > STREAM_MAX_RECORD_BYTES:
+                yield record_too_large(STREAM_MAX_RECORD_BYTES)
+                continue
+            try:
+                yield json.loads(message)
+            except ValueError as e:
+                yield {"error": f"Invalid JSON: {str(e)}"}
+    
+    try:
+        # Closing the results stops the reader even if a send fails
+        async with aclosing(stream_batches(
+            records(),
+            predict_stream_batch,
+            max_batch=STREAM_MAX_BATCH,
+            max_pending=STREAM_MAX_PENDING
+        )) as results:
+            async for result in results:
+                await websocket.send_text(json.dumps(result, default=str))
+    except WebSocketDisconnect:
+        # Client went away before all results were sent
+        return
+    except Exception as e:
+        metrics.track_error("prediction_error")
+        print(f"Error in prediction stream: {str(e)}")
+        await websocket.close(code=1011, reason="Prediction error")
+        return
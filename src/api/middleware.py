@@ -1,7 +1,12 @@
 # src/api/middleware.py
 from fastapi import Request
+from fastapi.responses import JSONResponse
 import time
-from prometheus_client import Counter, Histogram
+from typing import Tuple
+from prometheus_client import Counter, Gauge, Histogram
+
+from src.api.admission import AdmissionController, AdmissionRejected
+from src.monitoring.tracing import tracer
 
 # API metrics
 REQUEST_COUNT = Counter(
@@ -16,12 +21,38 @@ REQUEST_LATENCY = Histogram(
     ['method', 'endpoint']
 )
 
+# Admission control metrics
+ADMISSION_QUEUE_DEPTH = Gauge(
+    'api_admission_queue_depth',
+    'Requests waiting for an admission slot'
+)
+
+ADMISSION_IN_FLIGHT = Gauge(
+    'api_admission_in_flight',
+    'Requests currently admitted'
+)
+
+ADMISSION_LIMIT = Gauge(
+    'api_admission_concurrency_limit',
+    'Current adaptive concurrency limit'
+)
+
+ADMISSION_SHED = Counter(
+    'api_admission_shed_total',
+    'Requests rejected by admission control',
+    ['endpoint', 'reason']
+)
+
 async def metrics_middleware(request: Request, call_next):
-    """Middleware to collect API metrics"""
+    """Middleware to collect API metrics and trace requests"""
     start_time = time.time()
     
     # Process request
-    response = await call_next(request)
+    with tracer.trace(f"{request.method} {request.url.path}") as span:
+        response = await call_next(request)
+        span.set_attribute("status_code", response.status_code)
+        if response.status_code >= 500:
+            span.set_error(f"HTTP {response.status_code}")
     
     # Record metrics
     latency = time.time() - start_time
@@ -37,3 +68,39 @@ async def metrics_middleware(request: Request, call_next):
     ).observe(latency)
     
     return response
+
+def admission_middleware(controller: AdmissionController, paths: Tuple[str, ...]):
+    """
+    Middleware that admits requests to the given paths through an
+    AdmissionController, shedding them with 429/503 and Retry-After
+    """
+    # Read the controller state when Prometheus scrapes
+    ADMISSION_QUEUE_DEPTH.set_function(lambda: controller.queue_depth)
+    ADMISSION_IN_FLIGHT.set_function(lambda: controller.in_flight)
+    ADMISSION_LIMIT.set_function(lambda: controller.current_limit)
+    
+    async def middleware(request: Request, call_next):
+        if request.url.path not in paths:
+            return await call_next(request)
+        
+        try:
+            await controller.acquire()
+        except AdmissionRejected as e:
+            ADMISSION_SHED.labels(endpoint=request.url.path, reason=e.reason).inc()
+            return JSONResponse(
+                status_code=e.status_code,
+                content={"detail": f"Server overloaded ({e.reason}), retry later"},
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        
+        start_time = time.time()
+        try:
+            response = await call_next(request)
+        except Exception:
+            controller.release()
+            raise
+        
+        controller.release(time.time() - start_time)
+        return response
+    
+    return middleware
@@ -0,0 +1,92 @@
+# src/api/startup.py
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class StartupState:
+    """
+    Tracks the readiness of components that are initialized in the background
+
+    Each component is a named stage. Stages run in parallel on a small thread
+    pool so the server can accept connections (and answer liveness probes)
+    while heavy modules are still being imported and data is being loaded.
+    """
+    def __init__(self, stages: List[str]):
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._stages = {name: {"status": PENDING} for name in stages}
+        self._futures: List[Future] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self, loaders: Dict[str, Callable[[], Any]]) -> List[Future]:
+        """
+        Run every loader in the background
+
+        Args:
+            loaders: Mapping of stage name to a zero-argument callable
+
+        Returns:
+            List of futures, one per stage
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(len(loaders), 1),
+            thread_name_prefix="startup"
+        )
+        self._futures = [
+            self._executor.submit(self._run_stage, name, loader)
+            for name, loader in loaders.items()
+        ]
+        self._executor.shutdown(wait=False)
+        return self._futures
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until all stages have finished, returns True if all are ready"""
+        deadline = None if timeout is None else time.time() + timeout
+        for future in self._futures:
+            remaining = None if deadline is None else max(deadline - time.time(), 0)
+            try:
+                future.result(timeout=remaining)
+            except Exception:
+                return False
+        return self.is_ready()
+
+    def _run_stage(self, name: str, loader: Callable[[], Any]):
+        """Run a single stage and record its status and timing"""
+        start_time = time.time()
+        self._update(name, status=LOADING)
+        try:
+            loader()
+        except Exception as e:
+            self._update(
+                name,
+                status=FAILED,
+                error=str(e),
+                duration_ms=(time.time() - start_time) * 1000
+            )
+            print(f"Error loading {name}: {str(e)}")
+            traceback.print_exc()
+            return
+        self._update(name, status=READY, duration_ms=(time.time() - start_time) * 1000)
+
+    def _update(self, name: str, **fields):
+        with self._lock:
+            self._stages.setdefault(name, {}).update(fields)
+
+    def is_ready(self, *names: str) -> bool:
+        """Check whether the given stages (or all stages) are ready"""
+        with self._lock:
+            stages = names or tuple(self._stages)
+            return all(self._stages.get(name, {}).get("status") == READY for name in stages)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return a copy of the status of every stage"""
+        with self._lock:
+            return {name: dict(info) for name, info in self._stages.items()}
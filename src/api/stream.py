@@ -0,0 +1,128 @@
+# src/api/stream.py
+import asyncio
+import json
+from typing import Any, AsyncIterator, Callable, Dict, List
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+_END = object()
+
+# Default maximum size of one streamed record
+MAX_RECORD_BYTES = 1024 * 1024
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Streaming response for endpoints that keep reading the request body
+
+    StreamingResponse listens for client disconnects by calling receive()
+    on ASGI servers older than spec 2.4 (including uvicorn), which consumes
+    the request body messages that request.stream() is waiting for. This
+    response only sends the body and leaves every receive() to the endpoint.
+    """
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def ndjson_records(chunks: AsyncIterator[bytes],
+                         max_record_bytes: int = MAX_RECORD_BYTES) -> AsyncIterator[Any]:
+    """
+    Parse newline-delimited JSON from a byte stream
+
+    Lines that are not valid JSON, or longer than max_record_bytes, are
+    yielded as a dict with an 'error' key so the caller can answer them in
+    order. The rest of an oversized line is discarded without buffering it.
+    """
+    buffer = bytearray()
+    discarding = False
+    async for chunk in chunks:
+        start = 0
+        while True:
+            # Only the new bytes are searched for the end of the line
+            newline = chunk.find(b"\n", start)
+            end = len(chunk) if newline < 0 else newline
+            if not discarding:
+                buffer += chunk[start:end]
+                if len(buffer) > max_record_bytes:
+                    yield record_too_large(max_record_bytes)
+                    buffer.clear()
+                    discarding = True
+            if newline < 0:
+                break
+            if not discarding and buffer.strip():
+                yield _parse_line(buffer)
+            buffer.clear()
+            discarding = False
+            start = newline + 1
+    if not discarding and buffer.strip():
+        yield _parse_line(buffer)
+
+
+def record_too_large(max_record_bytes: int) -> dict:
+    return {"error": f"Record exceeds {max_record_bytes} bytes"}
+
+
+def _parse_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return {"error": f"Invalid JSON: {str(e)}"}
+
+
+async def stream_batches(records: AsyncIterator[Any],
+                         process_batch: Callable[[List[Any]], List[Dict[str, Any]]],
+                         max_batch: int = 64,
+                         max_pending: int = 256) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Feed a stream of records through a batch function, yielding results in order
+
+    Records are read into a bounded queue. When the queue is full the reader
+    stops pulling from the connection, which propagates backpressure to the
+    client. Whatever is queued when the processor is free is taken as one
+    micro-batch (up to max_batch) and processed in a worker thread.
+
+    Args:
+        records: Async iterator of incoming records
+        process_batch: Returns one result per record, in the same order
+        max_batch: Maximum records per batch
+        max_pending: Maximum records read ahead of processing
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+
+    async def reader():
+        # The end marker is only queued while the consumer is still reading.
+        # A cancelled reader must not wait for queue space that will never
+        # be freed.
+        try:
+            async for record in records:
+                await queue.put(record)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            await queue.put(_END)
+            raise
+        await queue.put(_END)
+
+    reader_task = asyncio.create_task(reader())
+    try:
+        done = False
+        while not done:
+            batch = [await queue.get()]
+            while len(batch) < max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch[-1] is _END:
+                batch.pop()
+                done = True
+            if batch:
+                for result in await run_in_threadpool(process_batch, batch):
+                    yield result
+        # Surface errors from the reader (e.g. a broken connection)
+        await reader_task
+    finally:
+        if not reader_task.done():
+            reader_task.cancel()
+            await asyncio.wait([reader_task])
@@ -2,15 +2,60 @@
 import pandas as pd
 import numpy as np
 from scipy import stats
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
+import math
+import time
+
+from src.data_validation.profile import ReferenceProfile
+from src.data_validation.streaming import SlidingWindowStatistics
+from src.monitoring.tracing import traced
+
+# Sample size used to measure the cost of a test when only a time limit is set
+CALIBRATION_SAMPLES = 1000
+# Smallest sample cap derived from a time limit
+MIN_DERIVED_SAMPLES = 100
+
+class DriftBudget:
+    """
+    Compute budget for approximate drift detection
+    
+    Args:
+        max_samples: Maximum number of samples used from the current window
+            and from the reference for each feature
+        time_limit: Maximum wall-clock seconds for one evaluation. Without
+            max_samples, the sample cap is derived from the measured cost of
+            a test. Features not reached in time are reported as skipped.
+        confidence: Confidence level of the reported intervals
+        seed: Random seed for reproducible subsampling
+    """
+    def __init__(self, max_samples: Optional[int] = None, time_limit: Optional[float] = None,
+                 confidence: float = 0.95, seed: Optional[int] = None):
+        if max_samples is None and time_limit is None:
+            raise ValueError("Either max_samples or time_limit must be provided")
+        self.max_samples = max_samples
+        self.time_limit = time_limit
+        self.confidence = confidence
+        self.seed = seed
 
 class DriftDetector:
-    def __init__(self, reference_data: pd.DataFrame):
+    def __init__(self, reference_data: Optional[pd.DataFrame] = None,
+                 profile: Optional[ReferenceProfile] = None):
         """
-        Initialize with reference (training) data
+        Initialize with reference (training) data or a precompiled reference profile
         """
+        if profile is None:
+            if reference_data is None:
+                raise ValueError("Either reference_data or profile must be provided")
+            profile = ReferenceProfile.from_dataframe(reference_data)
         self.reference_data = reference_data
-        self.reference_stats = self._compute_statistics(reference_data)
+        self.profile = profile
+        self.reference_stats = profile.statistics()
+        self._segment_references: Dict[str, Dict[str, Any]] = {}
+    
+    @classmethod
+    def from_profile(cls, profile_path: str, use_mmap: bool = True) -> "DriftDetector":
+        """Create a detector from a reference profile file built offline"""
+        return cls(profile=ReferenceProfile.load(profile_path, use_mmap=use_mmap))
         
     def _compute_statistics(self, data: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
         """Compute statistics for each column"""
@@ -34,13 +79,20 @@ class DriftDetector:
             
         return stats_dict
     
+    @traced("drift.detect_drift")
     def detect_drift(self, current_data: pd.DataFrame, 
-                     threshold: float = 0.05) -> Dict[str, Any]:
+                     threshold: float = 0.05,
+                     budget: Optional[DriftBudget] = None) -> Dict[str, Any]:
         """
         Detect drift between reference and current data
         Returns drift metrics and flagged features
+        
+        With a budget, statistics are computed on subsamples and reported with
+        confidence intervals (see _detect_drift_approximate).
         """
-        current_stats = self._compute_statistics(current_data)
+        if budget is not None:
+            return self._detect_drift_approximate(current_data, threshold, budget)
+        
         drift_results = {
             'drift_detected': False,
             'feature_drifts': {},
@@ -48,13 +100,13 @@ class DriftDetector:
         }
         
         # Check numeric features using Kolmogorov-Smirnov test
-        for col in self.reference_data.select_dtypes(include=[np.number]).columns:
+        for col in self.profile.numeric_columns:
             if col not in current_data.columns:
                 continue
                 
             # Perform KS test
             ks_stat, p_value = stats.ks_2samp(
-                self.reference_data[col].dropna(),
+                self.profile.sorted_values(col),
                 current_data[col].dropna()
             )
             
@@ -70,13 +122,13 @@ class DriftDetector:
                 drift_results['flagged_features'].append(col)
                 
         # Check categorical features using Chi-squared test
-        for col in self.reference_data.select_dtypes(include=['object', 'category']).columns:
+        for col in self.profile.categorical_columns:
             if col not in current_data.columns:
                 continue
             
             # Get value distributions
             ref_counts = self.reference_stats[col]['value_counts']
-            curr_counts = current_stats[col]['value_counts']
+            curr_counts = current_data[col].value_counts(normalize=True).to_dict()
             
             # Calculate JS divergence as an alternative
             js_div = self._jensen_shannon_divergence(ref_counts, curr_counts)
@@ -93,7 +145,431 @@ class DriftDetector:
         
         return drift_results
     
+    def _detect_drift_approximate(self, current_data: pd.DataFrame, threshold: float,
+                                  budget: DriftBudget) -> Dict[str, Any]:
+        """
+        Detect drift on subsamples within a compute budget
+        
+        The window is reduced to a uniform sample of rows and the
+        reference to a quantile-stratified sample (one value per equal-size
+        stratum of the sorted reference). Each KS statistic comes with a
+        confidence interval: the stratified reference ECDF is within 1/m of
+        the full ECDF, and the window ECDF error is bounded by the DKW
+        inequality.
+        
+        Categorical reference counts are exact (they come from the profile),
+        so only the window is sampled. The JS divergence interval uses the
+        L1 deviation bound for empirical distributions (Weissman et al.)
+        with JS <= total variation and the triangle inequality for sqrt(JS).
+        When the window is not sampled, the interval is the statistic itself.
+        """
+        start_time = time.perf_counter()
+        deadline = None if budget.time_limit is None else start_time + budget.time_limit
+        rng = np.random.default_rng(budget.seed)
+        alpha = 1 - budget.confidence
+        
+        max_samples = budget.max_samples
+        if max_samples is None:
+            max_samples = self._time_limited_sample_cap(current_data, budget.time_limit, rng)
+        
+        # Sample rows once so all features see the same window subsample
+        n_rows = len(current_data)
+        if n_rows > max_samples:
+            rows = rng.choice(n_rows, size=max_samples, replace=False)
+            current_data = current_data.iloc[np.sort(rows)]
+        window_sampled = len(current_data) < n_rows
+        
+        drift_results = {
+            'drift_detected': False,
+            'feature_drifts': {},
+            'flagged_features': [],
+            'approximate': True,
+            'window_size': n_rows,
+            'sample_cap': max_samples,
+            'skipped_features': []
+        }
+        
+        for col in self.profile.numeric_columns:
+            if col not in current_data.columns:
+                continue
+            if deadline is not None and time.perf_counter() > deadline:
+                drift_results['skipped_features'].append(col)
+                continue
+            
+            current_values = current_data[col].dropna().to_numpy()
+            reference_values, reference_error = self._stratified_reference_sample(
+                col, max_samples, rng
+            )
+            if len(current_values) == 0 or len(reference_values) == 0:
+                continue
+            
+            ks_stat, p_value = stats.ks_2samp(reference_values, current_values)
+            current_error = (
+                math.sqrt(math.log(2 / alpha) / (2 * len(current_values)))
+                if window_sampled else 0.0
+            )
+            margin = reference_error + current_error
+            
+            drift_results['feature_drifts'][col] = {
+                'test': 'ks',
+                'statistic': ks_stat,
+                'p_value': p_value,
+                'drift': p_value < threshold,
+                'confidence_interval': (max(ks_stat - margin, 0.0), min(ks_stat + margin, 1.0)),
+                'confidence': budget.confidence,
+                'sample_sizes': {
+                    'reference': len(reference_values),
+                    'current': len(current_values)
+                }
+            }
+            
+            if p_value < threshold:
+                drift_results['drift_detected'] = True
+                drift_results['flagged_features'].append(col)
+        
+        for col in self.profile.categorical_columns:
+            if col not in current_data.columns:
+                continue
+            if deadline is not None and time.perf_counter() > deadline:
+                drift_results['skipped_features'].append(col)
+                continue
+            
+            ref_counts = self.reference_stats[col]['value_counts']
+            curr_counts = current_data[col].value_counts(normalize=True).to_dict()
+            js_div = self._jensen_shannon_divergence(ref_counts, curr_counts)
+            n_current = int(current_data[col].count())
+            
+            margin = 0.0
+            if window_sampled and n_current > 0:
+                # ln(2^k - 2) for k categories, computed without overflow
+                k = max(len(set(ref_counts) | set(curr_counts)), 2)
+                log_partitions = k * math.log(2) + math.log1p(-2.0 ** (1 - k))
+                l1_error = math.sqrt(2 * (log_partitions - math.log(alpha)) / n_current)
+                margin = math.sqrt(min(l1_error / 2, 1.0))
+            root = math.sqrt(js_div)
+            
+            drift_results['feature_drifts'][col] = {
+                'test': 'jensen_shannon',
+                'statistic': js_div,
+                'drift': js_div > threshold,
+                'confidence_interval': (max(root - margin, 0.0) ** 2, min(root + margin, 1.0) ** 2),
+                'confidence': budget.confidence,
+                'sample_sizes': {'current': n_current}
+            }
+            
+            if js_div > threshold:
+                drift_results['drift_detected'] = True
+                drift_results['flagged_features'].append(col)
+        
+        drift_results['elapsed_seconds'] = time.perf_counter() - start_time
+        drift_results['budget_exhausted'] = bool(drift_results['skipped_features'])
+        return drift_results
+    
+    def _time_limited_sample_cap(self, current_data: pd.DataFrame, time_limit: float,
+                                 rng: np.random.Generator) -> int:
+        """
+        Sample cap that fits every feature into the time limit
+        
+        Times a KS test on CALIBRATION_SAMPLES values from each side and
+        scales it linearly, keeping half of each feature's share of the time
+        limit as headroom for sampling and bookkeeping.
+        """
+        columns = [col for col in self.profile.numeric_columns if col in current_data.columns]
+        n_features = len(columns) + sum(
+            col in current_data.columns for col in self.profile.categorical_columns
+        )
+        current_values = current_data[columns[0]].dropna().to_numpy() if columns else []
+        reference_values = self.profile.sorted_values(columns[0]) if columns else []
+        if len(current_values) == 0 or len(reference_values) == 0:
+            return max(len(current_data), MIN_DERIVED_SAMPLES)
+        
+        size = min(CALIBRATION_SAMPLES, len(current_values))
+        current_sample = current_values[rng.integers(0, len(current_values), size)]
+        reference_sample = reference_values[rng.integers(0, len(reference_values), size)]
+        calibration_start = time.perf_counter()
+        stats.ks_2samp(reference_sample, current_sample)
+        cost_per_sample = max(time.perf_counter() - calibration_start, 1e-9) / (2 * size)
+        
+        per_feature = time_limit / n_features / 2
+        return max(int(per_feature / cost_per_sample / 2), MIN_DERIVED_SAMPLES)
+    
+    def _stratified_reference_sample(self, col: str, max_samples: Optional[int],
+                                     rng: np.random.Generator) -> tuple:
+        """
+        Draw one value from each of max_samples equal-size strata of the
+        sorted reference column
+        
+        Returns the sample and the maximum ECDF error it introduces
+        """
+        sorted_values = self.profile.sorted_values(col)
+        n_values = len(sorted_values)
+        if max_samples is None or n_values <= max_samples:
+            return sorted_values, 0.0
+        
+        positions = (np.arange(max_samples) + rng.random(max_samples)) * n_values / max_samples
+        indices = np.minimum(positions.astype(np.int64), n_values - 1)
+        return sorted_values[indices], 1.0 / max_samples
+    
+    @traced("drift.detect_drift_segmented")
+    def detect_drift_segmented(self, current_data: pd.DataFrame, segment_column: str,
+                               threshold: float = 0.05,
+                               max_segments: int = 50) -> Dict[str, Any]:
+        """
+        Detect drift separately for each segment (value of segment_column)
+        
+        Every segment and feature is evaluated from one grouped pass over
+        current_data: values are binned on the reference histogram edges and
+        counted per (segment, bin) with a single bincount per feature. The
+        same counts for the reference come from the profile, so a detector
+        loaded from a profile file needs no reference data. Numeric features use the binned KS test and categorical
+        features the Jensen-Shannon divergence, as in detect_drift_window.
+        
+        Args:
+            current_data: Current data including segment_column
+            segment_column: Column whose values define the segments
+            threshold: Drift threshold for p-values and JS divergence
+            max_segments: Maximum number of segments evaluated; the largest
+                segments in current_data are kept
+        
+        Returns:
+            Drift results per segment, with segments missing from the
+            reference listed in 'unknown_segments'
+        """
+        if segment_column not in current_data.columns:
+            raise ValueError(f"Segment column '{segment_column}' not in current data")
+        reference = self._segment_reference(segment_column)
+        segments = reference['segments']
+        
+        segment_values = current_data[segment_column]
+        present = segment_values.notna().to_numpy()
+        segment_labels = segment_values.astype(str).to_numpy()
+        codes = segments.get_indexer(segment_labels)
+        codes[~present] = -1
+        
+        unknown = sorted(set(segment_labels[present & (codes < 0)]))
+        sizes = np.bincount(codes[codes >= 0], minlength=len(segments))
+        evaluated = [int(code) for code in np.argsort(-sizes, kind='stable')
+                     if sizes[code] > 0][:max_segments]
+        
+        drift_results = {
+            'drift_detected': False,
+            'segment_column': segment_column,
+            'segments': {
+                segments[code]: {
+                    'drift_detected': False,
+                    'feature_drifts': {},
+                    'flagged_features': [],
+                    'window_size': int(sizes[code])
+                } for code in evaluated
+            },
+            'flagged_segments': [],
+            'unknown_segments': unknown,
+            'truncated_segments': int(np.count_nonzero(sizes)) - len(evaluated)
+        }
+        current = self.profile.count_by_segment(current_data, segment_column, codes, len(segments))
+        
+        for col, ref_counts in reference['numeric'].items():
+            if col not in current['numeric']:
+                continue
+            cur_counts = current['numeric'][col]
+            ks_stats, p_values = self._binned_ks_matrix(ref_counts[evaluated], cur_counts[evaluated])
+            for code, ks_stat, p_value, n_cur in zip(
+                    evaluated, ks_stats, p_values, cur_counts[evaluated].sum(axis=1)):
+                if n_cur == 0:
+                    continue
+                self._record_segment_drift(drift_results['segments'][segments[code]], col, {
+                    'test': 'ks_binned',
+                    'statistic': float(ks_stat),
+                    'p_value': float(p_value),
+                    'drift': bool(p_value < threshold)
+                })
+        
+        for col, ref_counts in reference['categorical'].items():
+            if col not in current['categorical']:
+                continue
+            cur_counts = current['categorical'][col]
+            js_values = self._js_divergence_matrix(ref_counts[evaluated], cur_counts[evaluated])
+            for code, js_div, n_cur in zip(evaluated, js_values, cur_counts[evaluated].sum(axis=1)):
+                if n_cur == 0:
+                    continue
+                self._record_segment_drift(drift_results['segments'][segments[code]], col, {
+                    'test': 'jensen_shannon',
+                    'statistic': float(js_div),
+                    'drift': bool(js_div > threshold)
+                })
+        
+        for segment, segment_result in drift_results['segments'].items():
+            if segment_result['drift_detected']:
+                drift_results['drift_detected'] = True
+                drift_results['flagged_segments'].append(segment)
+        
+        return drift_results
+    
+    @staticmethod
+    def _record_segment_drift(segment_result: Dict[str, Any], col: str, drift_info: Dict[str, Any]):
+        segment_result['feature_drifts'][col] = drift_info
+        if drift_info['drift']:
+            segment_result['drift_detected'] = True
+            segment_result['flagged_features'].append(col)
+    
+    def _segment_reference(self, segment_column: str) -> Dict[str, Any]:
+        """
+        Per-segment reference counts for a segment column
+        
+        Read from the profile, where they are precomputed at build time
+        (profile CLI --segment-columns). A detector built from reference_data
+        computes them once on first use.
+        """
+        if segment_column in self._segment_references:
+            return self._segment_references[segment_column]
+        if segment_column not in self.profile.segments:
+            if self.reference_data is None or segment_column not in self.reference_data.columns:
+                raise ValueError(
+                    f"Reference profile has no segment counts for '{segment_column}', "
+                    f"rebuild it with --segment-columns {segment_column}"
+                )
+            self.profile.add_segments(self.reference_data, segment_column)
+        
+        segment_info = self.profile.segments[segment_column]
+        reference = {
+            'segments': pd.Index(segment_info['values']),
+            'numeric': segment_info['numeric'],
+            'categorical': segment_info['categorical']
+        }
+        self._segment_references[segment_column] = reference
+        return reference
+    
+    def create_window(self, max_size: Optional[int] = None, max_age: Optional[float] = None,
+                      clock: Callable[[], float] = time.time) -> SlidingWindowStatistics:
+        """
+        Create a sliding window of current data aligned to the reference bins
+        
+        Records added to the window update its statistics incrementally, and
+        detect_drift_window evaluates drift from those statistics without
+        rescanning the window.
+        """
+        return SlidingWindowStatistics.from_profile(
+            self.profile, max_size=max_size, max_age=max_age, clock=clock
+        )
+    
+    @traced("drift.detect_drift_window")
+    def detect_drift_window(self, window: SlidingWindowStatistics,
+                            threshold: float = 0.05) -> Dict[str, Any]:
+        """
+        Detect drift between reference data and a sliding window
+        
+        Numeric features use a KS test on the histogram CDFs (the statistic is
+        the largest CDF difference at the reference bin edges), so evaluation
+        costs O(bins) per feature regardless of window size.
+        """
+        # Drop records past max_age so the window size matches the statistics
+        window.expire()
+        drift_results = {
+            'drift_detected': False,
+            'feature_drifts': {},
+            'flagged_features': [],
+            'window_size': len(window)
+        }
+        
+        for col, running in window.snapshot().items():
+            if running.count == 0:
+                continue
+            
+            ref_counts, _ = self.profile.histogram(col)
+            ks_stat, p_value = self._binned_ks_test(ref_counts, running)
+            
+            drift_results['feature_drifts'][col] = {
+                'test': 'ks_binned',
+                'statistic': ks_stat,
+                'p_value': p_value,
+                'drift': p_value < threshold
+            }
+            
+            if p_value < threshold:
+                drift_results['drift_detected'] = True
+                drift_results['flagged_features'].append(col)
+        
+        for col in window.categorical:
+            curr_counts = window.value_counts(col)
+            if not curr_counts:
+                continue
+            
+            ref_counts = self.reference_stats[col]['value_counts']
+            js_div = self._jensen_shannon_divergence(ref_counts, curr_counts)
+            
+            drift_results['feature_drifts'][col] = {
+                'test': 'jensen_shannon',
+                'statistic': js_div,
+                'drift': js_div > threshold
+            }
+            
+            if js_div > threshold:
+                drift_results['drift_detected'] = True
+                drift_results['flagged_features'].append(col)
+        
+        return drift_results
+    
+    @staticmethod
+    def _binned_ks_test(ref_counts: np.ndarray, running) -> tuple:
+        """KS statistic and asymptotic p-value from aligned histograms"""
+        # The reference has no mass outside its own edges, so compare the
+        # CDFs at [underflow, bins..., overflow]
+        ref_counts = np.concatenate(([0], np.asarray(ref_counts), [0]))
+        cur_counts = [running.underflow] + list(running.hist_counts) + [running.overflow]
+        ks_stats, p_values = DriftDetector._binned_ks_matrix(
+            ref_counts[np.newaxis, :], np.asarray([cur_counts])
+        )
+        return float(ks_stats[0]), float(p_values[0])
+    
+    @staticmethod
+    def _binned_ks_matrix(ref_counts: np.ndarray, cur_counts: np.ndarray) -> tuple:
+        """
+        Binned KS statistics and p-values for each row of two count matrices
+        
+        Rows are histograms on the same [underflow, bins..., overflow] layout.
+        Rows where either side is empty get a statistic of 0 and p-value of 1.
+        """
+        ref_counts = np.asarray(ref_counts, dtype=np.float64)
+        cur_counts = np.asarray(cur_counts, dtype=np.float64)
+        n_ref = ref_counts.sum(axis=1)
+        n_cur = cur_counts.sum(axis=1)
+        valid = (n_ref > 0) & (n_cur > 0)
+        
+        ks_stats = np.zeros(len(ref_counts))
+        p_values = np.ones(len(ref_counts))
+        if not valid.any():
+            return ks_stats, p_values
+        
+        ref_cdf = np.cumsum(ref_counts[valid], axis=1) / n_ref[valid, np.newaxis]
+        cur_cdf = np.cumsum(cur_counts[valid], axis=1) / n_cur[valid, np.newaxis]
+        ks_stats[valid] = np.max(np.abs(ref_cdf - cur_cdf), axis=1)
+        
+        en = n_ref[valid] * n_cur[valid] / (n_ref[valid] + n_cur[valid])
+        p_values[valid] = np.clip(
+            stats.distributions.kstwo.sf(ks_stats[valid], np.round(en)), 0.0, 1.0
+        )
+        return ks_stats, p_values
+    
     def _jensen_shannon_divergence(self, dist1, dist2):
-        """Calculate Jensen-Shannon divergence between two distributions"""
-        # Implementation details here
-        return 0.1  # Placeholder
+        """Calculate Jensen-Shannon divergence (base 2, in [0, 1]) between two distributions"""
+        categories = sorted(set(dist1) | set(dist2))
+        p = np.array([[dist1.get(category, 0.0) for category in categories]], dtype=np.float64)
+        q = np.array([[dist2.get(category, 0.0) for category in categories]], dtype=np.float64)
+        return float(self._js_divergence_matrix(p, q)[0])
+    
+    @staticmethod
+    def _js_divergence_matrix(p_counts: np.ndarray, q_counts: np.ndarray) -> np.ndarray:
+        """Jensen-Shannon divergence (base 2) between matching rows of two count matrices"""
+        p_counts = np.asarray(p_counts, dtype=np.float64)
+        q_counts = np.asarray(q_counts, dtype=np.float64)
+        p_total = p_counts.sum(axis=1, keepdims=True)
+        q_total = q_counts.sum(axis=1, keepdims=True)
+        p = np.divide(p_counts, p_total, out=np.zeros_like(p_counts), where=p_total > 0)
+        q = np.divide(q_counts, q_total, out=np.zeros_like(q_counts), where=q_total > 0)
+        m = (p + q) / 2
+        
+        def kl(a):
+            ratio = np.divide(a, m, out=np.ones_like(a), where=a > 0)
+            return np.sum(a * np.log2(ratio), axis=1)
+        
+        return np.clip((kl(p) + kl(q)) / 2, 0.0, 1.0)
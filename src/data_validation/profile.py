@@ -0,0 +1,379 @@
+# src/data_validation/profile.py
+"""
+Precompiled reference profiles
+
+A reference profile holds everything DriftDetector needs from the reference
+(training) data: sorted numeric columns, histograms, summary statistics,
+categorical count tables and, optionally, the same counts per segment (value
+of a segment column) for segmented drift detection. Profiles are built offline from the reference CSV
+and loaded memory-mapped at startup, so workers don't parse CSVs or recompute
+statistics on boot.
+
+File layout (all integers little-endian):
+
+    magic            8 bytes   b"MLREFPRF"
+    format version   uint32
+    reserved         uint32
+    header length    uint64
+    header           JSON, utf-8, padded to a 64-byte boundary
+    data             raw arrays, each starting on a 64-byte boundary
+
+The header records the offset, dtype and length of every array relative to
+the start of the data section.
+
+Usage:
+    python -m src.data_validation.profile reference_data.csv reference_profile.bin \
+        [--segment-columns region tier]
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"MLREFPRF"
+FORMAT_VERSION = 1
+PROFILE_FILENAME = "reference_profile.bin"
+
+_PREAMBLE = struct.Struct("<8sIIQ")
+_ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class ReferenceProfile:
+    """Reference statistics for drift detection, backed by numpy arrays"""
+    def __init__(self, numeric: Dict[str, Dict[str, Any]],
+                 categorical: Dict[str, Dict[str, Any]],
+                 num_rows: int, metadata: Optional[Dict[str, Any]] = None,
+                 segments: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Args:
+            numeric: Per-column dict with 'sorted', 'hist_counts', 'hist_edges'
+                arrays and 'stats' (mean, std, min, max, median, count)
+            categorical: Per-column dict with 'counts' ({value: count})
+            num_rows: Number of rows in the reference data
+            metadata: Free-form metadata stored in the header
+            segments: Per segment column, a dict with the segment 'values'
+                and 'numeric'/'categorical' count matrices (see add_segments)
+        """
+        self.numeric = numeric
+        self.categorical = categorical
+        self.num_rows = num_rows
+        self.metadata = metadata or {}
+        self.segments = segments or {}
+        self._buffer = None  # Keeps the memory map alive when loaded from disk
+
+    @classmethod
+    def from_dataframe(cls, data: pd.DataFrame, bins: int = 10,
+                       metadata: Optional[Dict[str, Any]] = None,
+                       segment_columns: Optional[List[str]] = None) -> "ReferenceProfile":
+        """Build a profile from reference data, with per-segment counts for segment_columns"""
+        numeric = {}
+        for col in data.select_dtypes(include=[np.number]).columns:
+            values = data[col].dropna().to_numpy(dtype=np.float64)
+            sorted_values = np.sort(values)
+            hist_counts, hist_edges = np.histogram(sorted_values, bins=bins)
+            numeric[col] = {
+                "sorted": sorted_values,
+                "hist_counts": hist_counts.astype(np.int64),
+                "hist_edges": hist_edges.astype(np.float64),
+                "stats": {
+                    "mean": data[col].mean(),
+                    "std": data[col].std(),
+                    "min": data[col].min(),
+                    "max": data[col].max(),
+                    "median": data[col].median(),
+                    "count": int(len(values))
+                }
+            }
+
+        categorical = {}
+        for col in data.select_dtypes(include=["object", "category"]).columns:
+            counts = data[col].value_counts()
+            categorical[col] = {
+                "counts": {str(value): int(count) for value, count in counts.items()}
+            }
+
+        profile = cls(numeric, categorical, num_rows=len(data), metadata=metadata)
+        for segment_column in segment_columns or []:
+            profile.add_segments(data, segment_column)
+        return profile
+
+    @property
+    def numeric_columns(self) -> List[str]:
+        return list(self.numeric)
+
+    @property
+    def categorical_columns(self) -> List[str]:
+        return list(self.categorical)
+
+    def sorted_values(self, col: str) -> np.ndarray:
+        """Sorted, NaN-free reference values of a numeric column"""
+        return self.numeric[col]["sorted"]
+
+    def histogram(self, col: str):
+        """Reference histogram of a numeric column as (counts, edges)"""
+        return self.numeric[col]["hist_counts"], self.numeric[col]["hist_edges"]
+
+    def categories(self, col: str) -> pd.Index:
+        """Sorted reference categories of a categorical column"""
+        return pd.Index(sorted(self.categorical[col]["counts"]))
+
+    def add_segments(self, data: pd.DataFrame, segment_column: str):
+        """Compute reference counts for every value of segment_column in data"""
+        if segment_column not in data.columns:
+            raise ValueError(f"Segment column '{segment_column}' not in reference data")
+        segment_values = data[segment_column]
+        codes, values = pd.factorize(segment_values.astype(str).where(segment_values.notna()))
+        self.segments[segment_column] = {
+            "values": [str(value) for value in values],
+            **self.count_by_segment(data, segment_column, codes, len(values))
+        }
+
+    def count_by_segment(self, data: pd.DataFrame, segment_column: str,
+                         codes: np.ndarray, n_segments: int) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Count values per (segment, bin) for numeric columns and per
+        (segment, category) for categorical columns, in one bincount per column
+
+        Numeric bins are [underflow, reference bins..., overflow] on the
+        reference histogram edges. Categories are those of categories(col),
+        plus one column for values not seen in the reference. Rows with a
+        negative segment code are ignored.
+
+        Returns:
+            {'numeric': {col: counts}, 'categorical': {col: counts}} with
+            one row of counts per segment
+        """
+        in_segment = codes >= 0
+        counts = {"numeric": {}, "categorical": {}}
+
+        for col in self.numeric_columns:
+            if col not in data.columns or col == segment_column:
+                continue
+            edges = self.numeric[col]["hist_edges"]
+            n_bins = len(edges) - 1
+            values = pd.to_numeric(data[col], errors="coerce").to_numpy(dtype=np.float64)
+            keep = in_segment & ~np.isnan(values)
+            values = values[keep]
+            # Extended bin index: 0 is underflow, n_bins + 1 is overflow, and
+            # the last bin includes its right edge as in np.histogram
+            bins = np.searchsorted(edges, values, side="right")
+            bins[values == edges[-1]] = n_bins
+            counts["numeric"][col] = np.bincount(
+                codes[keep] * (n_bins + 2) + bins, minlength=n_segments * (n_bins + 2)
+            ).reshape(n_segments, n_bins + 2)
+
+        for col in self.categorical_columns:
+            if col not in data.columns or col == segment_column:
+                continue
+            categories = self.categories(col)
+            values = data[col]
+            keep = in_segment & values.notna().to_numpy()
+            category_codes = categories.get_indexer(values[keep].astype(str))
+            category_codes[category_codes < 0] = len(categories)
+            width = len(categories) + 1
+            counts["categorical"][col] = np.bincount(
+                codes[keep] * width + category_codes, minlength=n_segments * width
+            ).reshape(n_segments, width)
+
+        return counts
+
+    def statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics in the same shape as DriftDetector._compute_statistics"""
+        stats_dict = {}
+        for col, info in self.numeric.items():
+            stats_dict[col] = {
+                **{k: v for k, v in info["stats"].items() if k != "count"},
+                "hist": (info["hist_counts"], info["hist_edges"])
+            }
+        for col, info in self.categorical.items():
+            total = sum(info["counts"].values())
+            stats_dict[col] = {
+                "value_counts": {
+                    value: count / total for value, count in info["counts"].items()
+                } if total else {},
+                "unique_count": len(info["counts"])
+            }
+        return stats_dict
+
+    def save(self, path: str):
+        """Write the profile to disk in the binary profile format"""
+        arrays = []
+        offset = 0
+
+        def add_array(array: np.ndarray) -> Dict[str, Any]:
+            nonlocal offset
+            array = np.ascontiguousarray(array)
+            array = array.astype(array.dtype.newbyteorder("<"), copy=False)
+            offset = _align(offset)
+            spec = {"offset": offset, "dtype": array.dtype.str, "length": int(array.size)}
+            if array.ndim > 1:
+                spec["shape"] = list(array.shape)
+            arrays.append((offset, array))
+            offset += array.nbytes
+            return spec
+
+        numeric_header = {}
+        for col, info in self.numeric.items():
+            numeric_header[col] = {
+                "stats": {k: _to_json(v) for k, v in info["stats"].items()},
+                "arrays": {
+                    key: add_array(info[key]) for key in ("sorted", "hist_counts", "hist_edges")
+                }
+            }
+
+        segments_header = {}
+        for segment_column, info in self.segments.items():
+            segments_header[segment_column] = {
+                "values": info["values"],
+                "numeric": {col: add_array(counts) for col, counts in info["numeric"].items()},
+                "categorical": {
+                    col: add_array(counts) for col, counts in info["categorical"].items()
+                }
+            }
+
+        header = json.dumps({
+            "format_version": FORMAT_VERSION,
+            "num_rows": int(self.num_rows),
+            "numeric": numeric_header,
+            "categorical": self.categorical,
+            "segments": segments_header,
+            "metadata": self.metadata
+        }).encode("utf-8")
+        data_start = _align(_PREAMBLE.size + len(header))
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, len(header)))
+            f.write(header)
+            for array_offset, array in arrays:
+                f.seek(data_start + array_offset)
+                f.write(array.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, use_mmap: bool = True) -> "ReferenceProfile":
+        """
+        Load a profile from disk
+
+        Args:
+            path: Path to a profile file
+            use_mmap: Memory-map the file instead of reading it into memory.
+                Arrays are then read-only views on the mapping.
+
+        Returns:
+            ReferenceProfile
+        """
+        with open(path, "rb") as f:
+            if use_mmap:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer = f.read()
+        return cls.from_buffer(buffer)
+
+    @classmethod
+    def from_buffer(cls, buffer) -> "ReferenceProfile":
+        """Build a profile whose arrays are views on a buffer in the profile format"""
+        view = memoryview(buffer)
+        magic, version, _, header_length = _PREAMBLE.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a reference profile file")
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported reference profile version {version}, expected {FORMAT_VERSION}"
+            )
+
+        header_end = _PREAMBLE.size + header_length
+        header = json.loads(bytes(view[_PREAMBLE.size:header_end]).decode("utf-8"))
+        data_start = _align(header_end)
+
+        def read_array(spec: Dict[str, Any]) -> np.ndarray:
+            if spec["length"] == 0:
+                array = np.empty(0, dtype=np.dtype(spec["dtype"]))
+            else:
+                array = np.frombuffer(
+                    view,
+                    dtype=np.dtype(spec["dtype"]),
+                    count=spec["length"],
+                    offset=data_start + spec["offset"]
+                )
+            return array.reshape(spec["shape"]) if "shape" in spec else array
+
+        numeric = {}
+        for col, entry in header["numeric"].items():
+            info = {"stats": entry["stats"]}
+            for key, spec in entry["arrays"].items():
+                info[key] = read_array(spec)
+            numeric[col] = info
+
+        # Profiles written before segment support have no "segments" entry
+        segments = {}
+        for segment_column, entry in header.get("segments", {}).items():
+            segments[segment_column] = {
+                "values": entry["values"],
+                "numeric": {col: read_array(spec) for col, spec in entry["numeric"].items()},
+                "categorical": {
+                    col: read_array(spec) for col, spec in entry["categorical"].items()
+                }
+            }
+
+        profile = cls(numeric, header["categorical"], header["num_rows"], header["metadata"],
+                      segments=segments)
+        profile._buffer = buffer
+        return profile
+
+
+def _to_json(value):
+    """Convert numpy scalars and NaN to JSON-serializable values"""
+    if value is None:
+        return None
+    value = value.item() if hasattr(value, "item") else value
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a reference profile from a reference CSV")
+    parser.add_argument("reference_csv", help="Path to the reference data CSV")
+    parser.add_argument("output", help="Path of the profile file to write")
+    parser.add_argument("--bins", type=int, default=10, help="Number of histogram bins")
+    parser.add_argument("--segment-columns", nargs="+", default=[],
+                        help="Columns to precompute per-segment counts for segmented drift")
+    parser.add_argument("--model-name", help="Register the profile with this model in the registry")
+    parser.add_argument("--model-version", help="Model version to attach the profile to")
+    parser.add_argument("--tracking-uri", default="http://localhost:5000",
+                        help="URI for the MLflow tracking server")
+    args = parser.parse_args()
+    if args.model_name and not args.model_version:
+        parser.error("--model-version is required with --model-name")
+
+    data = pd.read_csv(args.reference_csv)
+    profile = ReferenceProfile.from_dataframe(
+        data,
+        bins=args.bins,
+        metadata={"source": os.path.basename(args.reference_csv)},
+        segment_columns=args.segment_columns
+    )
+    profile.save(args.output)
+    print(f"Wrote profile for {len(profile.numeric)} numeric and "
+          f"{len(profile.categorical)} categorical columns to {args.output}")
+
+    if args.model_name:
+        from src.model_registry.client import ModelRegistry
+
+        registry = ModelRegistry(tracking_uri=args.tracking_uri)
+        registry.log_reference_profile(args.model_name, args.model_version, args.output)
+        print(f"Registered profile with {args.model_name} version {args.model_version}")
+
+
+if __name__ == "__main__":
+    main()
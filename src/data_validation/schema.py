@@ -3,6 +3,83 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Union, Any
 import json
+import numbers
+
+from src.monitoring.tracing import traced
+
+# Row-level error codes, combined as bit flags
+ROW_MISSING = 1
+ROW_TYPE = 2
+ROW_RANGE = 4
+
+ERROR_CODE_NAMES = {
+    ROW_MISSING: "missing",
+    ROW_TYPE: "type",
+    ROW_RANGE: "range"
+}
+
+def describe_error_code(code: int) -> List[str]:
+    """Names of the errors set in a row-level error code"""
+    return [name for flag, name in ERROR_CODE_NAMES.items() if code & flag]
+
+class RowValidationResult:
+    """
+    Per-row validation results
+    
+    Attributes:
+        valid_mask: Boolean array, True for rows without errors
+        error_codes: Combined error flags for each row
+        column_codes: Error flags for each row, per schema column
+    """
+    def __init__(self, index: pd.Index, column_codes: Dict[str, np.ndarray]):
+        self.index = index
+        self.column_codes = column_codes
+        self.error_codes = np.zeros(len(index), dtype=np.uint8)
+        for codes in column_codes.values():
+            self.error_codes |= codes
+        self.valid_mask = self.error_codes == 0
+    
+    @property
+    def num_valid(self) -> int:
+        return int(self.valid_mask.sum())
+    
+    @property
+    def num_invalid(self) -> int:
+        return len(self.valid_mask) - self.num_valid
+    
+    def valid_rows(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Rows of data that passed validation"""
+        return data[self.valid_mask]
+    
+    def invalid_rows(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Rows of data that failed validation"""
+        return data[~self.valid_mask]
+    
+    def report(self, max_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Describe the invalid rows
+        
+        Returns:
+            List of {"row": position, "index": index label, "errors": {column: [error names]}}
+        """
+        positions = np.flatnonzero(~self.valid_mask)
+        if max_rows is not None:
+            positions = positions[:max_rows]
+        
+        report = []
+        for position in positions:
+            errors = {
+                col: describe_error_code(int(codes[position]))
+                for col, codes in self.column_codes.items()
+                if codes[position]
+            }
+            label = self.index[position]
+            report.append({
+                "row": int(position),
+                "index": label.item() if hasattr(label, "item") else label,
+                "errors": errors
+            })
+        return report
 
 class DataSchemaValidator:
     def __init__(self, schema_path=None, schema=None):
@@ -14,6 +91,7 @@ class DataSchemaValidator:
         else:
             raise ValueError("Either schema or schema_path must be provided")
             
+    @traced("schema.validate")
     def validate(self, data: pd.DataFrame) -> Dict[str, Any]:
         """
         Validate data against schema and return validation results
@@ -41,15 +119,17 @@ class DataSchemaValidator:
             if col not in data.columns:
                 continue
                 
-            # Type validation
+            # Type validation, bools are not accepted as numbers
             dtype = props.get("type")
-            if dtype == "numeric" and not pd.api.types.is_numeric_dtype(data[col]):
+            is_number = (pd.api.types.is_numeric_dtype(data[col])
+                         and not pd.api.types.is_bool_dtype(data[col]))
+            if dtype == "numeric" and not is_number:
                 results["valid"] = False
                 results["type_errors"].append(col)
                 results["errors"].append(f"Column {col} should be numeric")
             
             # Range validation
-            if "range" in props and pd.api.types.is_numeric_dtype(data[col]):
+            if "range" in props and is_number:
                 min_val, max_val = props["range"]
                 if data[col].min() < min_val or data[col].max() > max_val:
                     results["valid"] = False
@@ -59,3 +139,57 @@ class DataSchemaValidator:
                     )
         
         return results
+    
+    @traced("schema.validate_rows")
+    def validate_rows(self, data: pd.DataFrame) -> RowValidationResult:
+        """
+        Validate every row against the schema in a single vectorized pass
+        
+        Unlike validate, a bad row doesn't invalidate the batch: callers can
+        score result.valid_rows(data) and report result.report().
+        """
+        n_rows = len(data)
+        column_codes = {}
+        
+        for col, props in self.schema["features"].items():
+            codes = np.zeros(n_rows, dtype=np.uint8)
+            
+            if col not in data.columns:
+                if props.get("required", False):
+                    codes[:] = ROW_MISSING
+                    column_codes[col] = codes
+                continue
+            
+            values = data[col]
+            missing = values.isna().to_numpy()
+            if props.get("required", False):
+                codes[missing] |= ROW_MISSING
+            
+            if props.get("type") == "numeric" or "range" in props:
+                if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                    numeric = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                else:
+                    # Only real numbers count, not numeric strings or bools,
+                    # which validate() also rejects
+                    objects = values.to_numpy(dtype=object)
+                    is_number = np.fromiter(
+                        (isinstance(v, numbers.Real) and not isinstance(v, bool) for v in objects),
+                        dtype=bool,
+                        count=n_rows
+                    )
+                    numeric = np.full(n_rows, np.nan)
+                    numeric[is_number] = objects[is_number].astype(np.float64)
+                    # Values that are present but not numbers
+                    type_error = ~is_number & ~missing
+                    if props.get("type") == "numeric":
+                        codes[type_error] |= ROW_TYPE
+                
+                if "range" in props:
+                    min_val, max_val = props["range"]
+                    with np.errstate(invalid="ignore"):
+                        out_of_range = (numeric < min_val) | (numeric > max_val)
+                    codes[out_of_range] |= ROW_RANGE
+            
+            column_codes[col] = codes
+        
+        return RowValidationResult(data.index, column_codes)
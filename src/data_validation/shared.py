@@ -0,0 +1,97 @@
+# src/data_validation/shared.py
+"""
+Reference profiles shared across worker processes
+
+Profiles are memory-mapped read-only, so every worker that maps the same
+file shares one copy of the reference arrays through the OS page cache.
+When only a reference CSV is available, the first process to get here (the
+parent, or the first worker) builds the profile once into a shared directory
+under a file lock, and the other workers attach to the result instead of
+each parsing the CSV into a private DataFrame.
+"""
+import os
+import tempfile
+from typing import List, Optional
+
+from src.data_validation.profile import ReferenceProfile
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+def default_shared_dir() -> str:
+    """Directory for shared profiles, /dev/shm when available"""
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def shared_profile_path(name: str, shared_dir: Optional[str] = None) -> str:
+    """Path of the shared profile for a name (usually model name and version)"""
+    safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+    return os.path.join(shared_dir or default_shared_dir(), f"mlops-{safe_name}.profile")
+
+
+def prepare_shared_profile(name: str, reference_csv: str,
+                           shared_dir: Optional[str] = None, bins: int = 10,
+                           segment_columns: Optional[List[str]] = None) -> str:
+    """
+    Build the shared profile from a reference CSV if it is missing or stale
+
+    Safe to call from every worker: only one process builds the profile while
+    the others wait on the lock and then reuse it.
+
+    Returns:
+        Path of the shared profile
+    """
+    path = shared_profile_path(name, shared_dir)
+    with open(f"{path}.lock", "w") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if (not os.path.exists(path)
+                    or os.path.getmtime(path) < os.path.getmtime(reference_csv)):
+                import pandas as pd
+
+                profile = ReferenceProfile.from_dataframe(
+                    pd.read_csv(reference_csv),
+                    bins=bins,
+                    metadata={"source": os.path.basename(reference_csv)},
+                    segment_columns=segment_columns
+                )
+                profile.save(path)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    return path
+
+
+def attach_shared_profile(name: str, profile_path: Optional[str] = None,
+                          reference_csv: Optional[str] = None,
+                          shared_dir: Optional[str] = None,
+                          segment_columns: Optional[List[str]] = None) -> ReferenceProfile:
+    """
+    Attach read-only to a reference profile shared by all workers
+
+    Args:
+        name: Name of the shared profile, usually model name and version
+        profile_path: Precompiled profile, mapped directly when it exists
+        reference_csv: Reference data used to build the shared profile when
+            there is no precompiled one
+        shared_dir: Directory for the shared profile
+        segment_columns: Columns with per-segment counts, when the shared
+            profile is built from reference_csv
+
+    Returns:
+        ReferenceProfile backed by a shared read-only memory map
+    """
+    if profile_path and os.path.exists(profile_path):
+        return ReferenceProfile.load(profile_path, use_mmap=True)
+    if reference_csv is None:
+        raise ValueError("Either an existing profile_path or reference_csv must be provided")
+    path = prepare_shared_profile(
+        name, reference_csv, shared_dir=shared_dir, segment_columns=segment_columns
+    )
+    return ReferenceProfile.load(path, use_mmap=True)
@@ -0,0 +1,294 @@
+# src/data_validation/streaming.py
+"""
+Incremental statistics for drift windows
+
+RunningStatistics keeps Welford mean/variance, min/max and a histogram on
+fixed bin edges (aligned to the reference histogram) for one numeric column.
+SlidingWindowStatistics maintains these for every column over a FIFO window
+of recent records, so adding or expiring an event costs O(1) per column
+instead of recomputing statistics over the whole window.
+"""
+import math
+import numbers
+import threading
+import time
+from bisect import bisect_right
+from collections import Counter, deque
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class RunningStatistics:
+    """Mergeable running statistics for a single numeric column"""
+    def __init__(self, bin_edges: Optional[Sequence[float]] = None):
+        """
+        Args:
+            bin_edges: Fixed histogram bin edges, usually the reference
+                histogram edges. Values outside the edges are counted in
+                underflow/overflow.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.bin_edges = [float(edge) for edge in bin_edges] if bin_edges is not None else []
+        self.hist_counts = [0] * max(len(self.bin_edges) - 1, 0)
+        self.underflow = 0
+        self.overflow = 0
+
+    def _bin(self, value: float) -> int:
+        """Index of the bin for a value, -1 for underflow and len(bins) for overflow"""
+        n_bins = len(self.hist_counts)
+        if value < self.bin_edges[0]:
+            return -1
+        if value > self.bin_edges[-1]:
+            return n_bins
+        # The last bin includes its right edge, as in np.histogram
+        return min(bisect_right(self.bin_edges, value) - 1, n_bins - 1)
+
+    def _update_hist(self, value: float, delta: int):
+        if not self.hist_counts:
+            return
+        index = self._bin(value)
+        if index < 0:
+            self.underflow += delta
+        elif index >= len(self.hist_counts):
+            self.overflow += delta
+        else:
+            self.hist_counts[index] += delta
+
+    def add(self, value: float):
+        """Add a value"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self._update_hist(value, 1)
+
+    def remove(self, value: float):
+        """
+        Remove a previously added value
+
+        Mean, variance and histogram are updated exactly. Min and max can't
+        be maintained under removal in O(1) and are left unchanged;
+        SlidingWindowStatistics tracks them separately for FIFO windows.
+        """
+        if self.count <= 1:
+            self.reset()
+            return
+        delta = value - self.mean
+        self.count -= 1
+        self.mean -= delta / self.count
+        self._m2 = max(self._m2 - delta * (value - self.mean), 0.0)
+        self._update_hist(value, -1)
+
+    def merge(self, other: "RunningStatistics") -> "RunningStatistics":
+        """Combine with statistics over a disjoint set of values, in place"""
+        if self.hist_counts and self.bin_edges != other.bin_edges:
+            raise ValueError("Cannot merge statistics with different bin edges")
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.hist_counts = [a + b for a, b in zip(self.hist_counts, other.hist_counts)]
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.hist_counts = [0] * len(self.hist_counts)
+        self.underflow = 0
+        self.overflow = 0
+
+    def copy(self) -> "RunningStatistics":
+        clone = RunningStatistics(self.bin_edges or None)
+        return clone.merge(self)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1, matching pandas)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else float("nan")
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance) if self.count > 1 else float("nan")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Statistics in the same shape as DriftDetector._compute_statistics"""
+        empty = self.count == 0
+        return {
+            'mean': float("nan") if empty else self.mean,
+            'std': self.std,
+            'min': float("nan") if empty else self.min,
+            'max': float("nan") if empty else self.max,
+            'hist': (np.array(self.hist_counts), np.array(self.bin_edges)),
+            'count': self.count,
+            'underflow': self.underflow,
+            'overflow': self.overflow
+        }
+
+
+class SlidingWindowStatistics:
+    """
+    Per-column statistics over a FIFO window of recent records
+
+    Records are expired by count (max_size) and/or age (max_age seconds).
+    Records older than max_age are removed on every add, snapshot and
+    value_counts, so reads never include stale data. Each add or expiry
+    costs O(1) per column (amortized for min/max, which use monotonic
+    deques), independent of the window size.
+    """
+    def __init__(self, bin_edges: Dict[str, Sequence[float]],
+                 categorical_columns: Optional[List[str]] = None,
+                 max_size: Optional[int] = None, max_age: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            bin_edges: Histogram bin edges for each numeric column
+            categorical_columns: Columns whose value counts are tracked
+            max_size: Maximum number of records kept in the window
+            max_age: Maximum age of records in seconds
+            clock: Current time in seconds, used for timestamps and expiry
+        """
+        self.max_size = max_size
+        self.max_age = max_age
+        self.clock = clock
+        self.numeric = {col: RunningStatistics(edges) for col, edges in bin_edges.items()}
+        self.categorical = {col: Counter() for col in categorical_columns or []}
+        self._events = deque()
+        self._min = {col: deque() for col in self.numeric}
+        self._max = {col: deque() for col in self.numeric}
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_profile(cls, profile, max_size: Optional[int] = None,
+                     max_age: Optional[float] = None,
+                     clock: Callable[[], float] = time.time) -> "SlidingWindowStatistics":
+        """Create a window whose histograms are aligned to a reference profile"""
+        return cls(
+            {col: profile.histogram(col)[1] for col in profile.numeric_columns},
+            categorical_columns=profile.categorical_columns,
+            max_size=max_size,
+            max_age=max_age,
+            clock=clock
+        )
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def add(self, record: Dict[str, Any], timestamp: Optional[float] = None):
+        """Add a record (feature name to value) to the window"""
+        now = self.clock()
+        timestamp = now if timestamp is None else timestamp
+        with self._lock:
+            self._expire(now)
+            self._seq += 1
+            numeric_values = {}
+            for col, running in self.numeric.items():
+                value = record.get(col)
+                # numbers.Real also covers numpy scalars such as np.float32
+                if not isinstance(value, numbers.Real) or isinstance(value, bool) or math.isnan(value):
+                    continue
+                value = float(value)
+                running.add(value)
+                numeric_values[col] = value
+                self._push_extreme(self._min[col], value, lambda old, new: old >= new)
+                self._push_extreme(self._max[col], value, lambda old, new: old <= new)
+
+            categorical_values = {}
+            for col, counts in self.categorical.items():
+                value = record.get(col)
+                if value is None:
+                    continue
+                value = str(value)
+                counts[value] += 1
+                categorical_values[col] = value
+
+            self._events.append((self._seq, timestamp, numeric_values, categorical_values))
+            if self.max_size is not None:
+                while len(self._events) > self.max_size:
+                    self._remove_oldest()
+
+    def _push_extreme(self, extremes: deque, value: float, dominated):
+        while extremes and dominated(extremes[-1][1], value):
+            extremes.pop()
+        extremes.append((self._seq, value))
+
+    def _remove_oldest(self):
+        seq, _, numeric_values, categorical_values = self._events.popleft()
+        for col, value in numeric_values.items():
+            self.numeric[col].remove(value)
+            for extremes in (self._min[col], self._max[col]):
+                if extremes and extremes[0][0] == seq:
+                    extremes.popleft()
+        for col, value in categorical_values.items():
+            counts = self.categorical[col]
+            counts[value] -= 1
+            if counts[value] <= 0:
+                del counts[value]
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Remove records older than max_age, returns the number removed"""
+        with self._lock:
+            return self._expire(self.clock() if now is None else now)
+
+    def _expire(self, now: float) -> int:
+        if self.max_age is None:
+            return 0
+        cutoff = now - self.max_age
+        removed = 0
+        while self._events and self._events[0][1] < cutoff:
+            self._remove_oldest()
+            removed += 1
+        return removed
+
+    def snapshot(self) -> Dict[str, RunningStatistics]:
+        """Copy of the current numeric statistics, with exact window min/max"""
+        with self._lock:
+            self._expire(self.clock())
+            result = {}
+            for col, running in self.numeric.items():
+                clone = running.copy()
+                if self._min[col]:
+                    clone.min = self._min[col][0][1]
+                    clone.max = self._max[col][0][1]
+                result[col] = clone
+            return result
+
+    def value_counts(self, col: str, normalize: bool = True) -> Dict[str, float]:
+        """Value counts of a categorical column in the window"""
+        with self._lock:
+            self._expire(self.clock())
+            counts = dict(self.categorical[col])
+        total = sum(counts.values())
+        if not normalize or total == 0:
+            return counts
+        return {value: count / total for value, count in counts.items()}
+
+    def statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics in the same shape as DriftDetector._compute_statistics"""
+        stats_dict = {col: running.to_dict() for col, running in self.snapshot().items()}
+        for col in self.categorical:
+            value_counts = self.value_counts(col)
+            stats_dict[col] = {
+                'value_counts': value_counts,
+                'unique_count': len(value_counts)
+            }
+        return stats_dict
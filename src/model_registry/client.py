@@ -2,6 +2,10 @@ import os
 import mlflow
 from datetime import datetime
 
+from src.monitoring.tracing import traced
+
+REFERENCE_PROFILE_DIR = "reference_profile"
+
 class ModelRegistry:
     """
     Client for interacting with the model registry
@@ -17,6 +21,7 @@ class ModelRegistry:
         self.client = mlflow.tracking.MlflowClient(tracking_uri)
         mlflow.set_tracking_uri(tracking_uri)
         
+    @traced("registry.register_model")
     def register_model(self, model_path, name, tags=None):
         """
         Register a model to the MLflow registry with metadata
@@ -46,6 +51,7 @@ class ModelRegistry:
             
             return model_uri
             
+    @traced("registry.get_latest_model")
     def get_latest_model(self, name):
         """
         Retrieve the latest model version
@@ -61,6 +67,7 @@ class ModelRegistry:
             return None
         return latest_version[0]
     
+    @traced("registry.get_model_versions")
     def get_model_versions(self, name):
         """
         Get all versions of a model
@@ -73,6 +80,7 @@ class ModelRegistry:
         """
         return self.client.search_model_versions(f"name='{name}'")
     
+    @traced("registry.transition_model_stage")
     def transition_model_stage(self, name, version, stage):
         """
         Transition a model to a different stage
@@ -90,3 +98,49 @@ class ModelRegistry:
             version=version,
             stage=stage
         )
+    
+    @traced("registry.log_reference_profile")
+    def log_reference_profile(self, name, version, profile_path):
+        """
+        Store a reference profile next to a model version
+        
+        The profile is logged as an artifact of the run that produced the
+        model version.
+        
+        Args:
+            name: Name of the model
+            version: Version of the model
+            profile_path: Path to a reference profile file
+            
+        Returns:
+            Artifact path of the stored profile
+        """
+        run_id = self._get_run_id(name, version)
+        self.client.log_artifact(run_id, profile_path, artifact_path=REFERENCE_PROFILE_DIR)
+        return f"{REFERENCE_PROFILE_DIR}/{os.path.basename(profile_path)}"
+    
+    @traced("registry.download_reference_profile")
+    def download_reference_profile(self, name, version, dst_path,
+                                   filename="reference_profile.bin"):
+        """
+        Download the reference profile stored with a model version
+        
+        Args:
+            name: Name of the model
+            version: Version of the model
+            dst_path: Local directory to download the profile to
+            filename: File name the profile was logged under
+            
+        Returns:
+            Local path of the downloaded profile
+        """
+        run_id = self._get_run_id(name, version)
+        return self.client.download_artifacts(
+            run_id, f"{REFERENCE_PROFILE_DIR}/{filename}", dst_path
+        )
+    
+    def _get_run_id(self, name, version):
+        model_version = self.client.get_model_version(name, version)
+        if not model_version.run_id:
+            raise ValueError(f"Model {name} version {version} has no associated run")
+        return model_version.run_id
@@ -0,0 +1,123 @@
+# src/monitoring/collectors.py
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from typing import Any, Callable, Dict, Optional
+
+
+class DriftSnapshotCollector:
+    """
+    Custom Prometheus collector for drift metrics
+
+    Drift values are read when Prometheus scrapes, either from a snapshot
+    published with update() (a single reference assignment) or by calling a
+    drift source function. Request handlers therefore do no per-feature
+    metric work for drift.
+    """
+    def __init__(self, model_name: str, version: str):
+        self.model_name = model_name
+        self.version = version
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._source: Optional[Callable[[], Dict[str, Any]]] = None
+        self._scores: Dict[tuple, float] = {}
+        self._segments: Dict[str, Dict[str, Any]] = {}
+        self.source_errors = 0
+
+    def update(self, drift_result: Dict[str, Any]):
+        """Publish the latest drift result"""
+        self._snapshot = drift_result
+
+    def update_segments(self, segment_column: str, segments: Dict[str, Dict[str, Any]]):
+        """Publish the latest per-segment drift results for a segment column"""
+        self._segments = {**self._segments, segment_column: segments}
+
+    def set_source(self, source: Optional[Callable[[], Dict[str, Any]]]):
+        """Compute drift at scrape time by calling source()"""
+        self._source = source
+
+    def set_score(self, feature_name: str, score: float, method: str):
+        """Set an individual drift score"""
+        self._scores[(feature_name, method)] = score
+
+    def _current(self) -> Optional[Dict[str, Any]]:
+        if self._source is not None:
+            try:
+                self._snapshot = self._source()
+            except Exception:
+                self.source_errors += 1
+        return self._snapshot
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        labels = [self.model_name, self.version]
+        drift_score = GaugeMetricFamily(
+            'model_drift_score',
+            'Drift score for each feature',
+            labels=['model_name', 'version', 'feature_name', 'drift_method']
+        )
+        p_value = GaugeMetricFamily(
+            'model_drift_p_value',
+            'Drift test p-value for each feature',
+            labels=['model_name', 'version', 'feature_name', 'drift_method']
+        )
+        flagged = GaugeMetricFamily(
+            'model_drift_flagged_features',
+            'Number of features flagged for drift',
+            labels=['model_name', 'version']
+        )
+        window_size = GaugeMetricFamily(
+            'model_drift_window_size',
+            'Number of records in the current drift window',
+            labels=['model_name', 'version']
+        )
+        segment_score = GaugeMetricFamily(
+            'model_segment_drift_score',
+            'Drift score for each feature within a segment',
+            labels=['model_name', 'version', 'segment_column', 'segment',
+                    'feature_name', 'drift_method']
+        )
+        segment_flagged = GaugeMetricFamily(
+            'model_segment_drift_flagged_features',
+            'Number of features flagged for drift within a segment',
+            labels=['model_name', 'version', 'segment_column', 'segment']
+        )
+        source_errors = CounterMetricFamily(
+            'model_drift_collector_errors',
+            'Errors computing drift at scrape time',
+            labels=['model_name', 'version']
+        )
+
+        scores = dict(self._scores)
+        snapshot = self._current()
+        if snapshot is not None:
+            for feature, drift_info in snapshot.get("feature_drifts", {}).items():
+                method = drift_info.get("test", "unknown")
+                if "statistic" in drift_info:
+                    scores[(feature, method)] = drift_info["statistic"]
+                if "p_value" in drift_info:
+                    p_value.add_metric(labels + [feature, method], drift_info["p_value"])
+            flagged.add_metric(labels, len(snapshot.get("flagged_features", [])))
+            if "window_size" in snapshot:
+                window_size.add_metric(labels, snapshot["window_size"])
+
+        for (feature, method), score in scores.items():
+            drift_score.add_metric(labels + [feature, method], score)
+        for segment_column, segments in self._segments.items():
+            for segment, result in segments.items():
+                segment_labels = labels + [segment_column, str(segment)]
+                for feature, drift_info in result.get("feature_drifts", {}).items():
+                    if "statistic" in drift_info:
+                        segment_score.add_metric(
+                            segment_labels + [feature, drift_info.get("test", "unknown")],
+                            drift_info["statistic"]
+                        )
+                segment_flagged.add_metric(segment_labels, len(result.get("flagged_features", [])))
+        source_errors.add_metric(labels, self.source_errors)
+
+        yield drift_score
+        yield p_value
+        yield flagged
+        yield window_size
+        yield segment_score
+        yield segment_flagged
+        yield source_errors
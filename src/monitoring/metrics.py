@@ -1,14 +1,33 @@
 # src/monitoring/metrics.py
-from prometheus_client import Counter, Gauge, Histogram, Summary
+from prometheus_client import Counter, Gauge, Histogram, Summary, REGISTRY
+import threading
 import time
 from functools import wraps
-from typing import Dict, List, Any, Callable
+from typing import Dict, Iterable, List, Any, Callable, Optional, Set
+
+from src.monitoring.collectors import DriftSnapshotCollector
+
+# Label value used for series rejected by the cardinality guard
+OVERFLOW_LABEL = "__overflow__"
 
 class MLMetricsCollector:
-    def __init__(self, model_name: str, version: str):
-        """Initialize metrics collectors for a specific model version"""
+    def __init__(self, model_name: str, version: str, max_series_per_metric: int = 1000):
+        """
+        Initialize metrics collectors for a specific model version
+        
+        Args:
+            model_name: Name of the model
+            version: Version of the model
+            max_series_per_metric: Maximum number of distinct values for
+                client-controlled labels (such as feature_name) per metric.
+                Further values are recorded under OVERFLOW_LABEL.
+        """
         self.model_name = model_name
         self.version = version
+        self.max_series_per_metric = max_series_per_metric
+        self._label_allowlist: Optional[Set[str]] = None
+        self._series: Dict[str, Set[str]] = {}
+        self._series_lock = threading.Lock()
         
         # Define metrics
         self.prediction_count = Counter(
@@ -30,17 +49,63 @@ class MLMetricsCollector:
             ['model_name', 'version', 'feature_name']
         )
         
-        self.drift_score = Gauge(
-            'model_drift_score',
-            'Drift score for each feature',
-            ['model_name', 'version', 'feature_name', 'drift_method']
-        )
+        # Drift metrics are produced at scrape time by a custom collector
+        self.drift_collector = DriftSnapshotCollector(model_name, version)
+        REGISTRY.register(self.drift_collector)
         
         self.prediction_errors = Counter(
             'model_prediction_errors',
             'Prediction errors',
             ['model_name', 'version', 'error_type']
         )
+        
+        self.cache_events = Counter(
+            'model_prediction_cache_events',
+            'Prediction cache hits, misses, evictions and invalidations',
+            ['model_name', 'version', 'event']
+        )
+        
+        self.rejected_labels = Counter(
+            'model_metric_labels_rejected',
+            'Label values recorded under the overflow bucket',
+            ['model_name', 'version', 'metric', 'reason']
+        )
+    
+    def set_feature_allowlist(self, feature_names: Optional[Iterable[str]]):
+        """
+        Only accept these feature names as label values, usually the features
+        of the loaded schema. None accepts any name within the series budget.
+        """
+        with self._series_lock:
+            self._label_allowlist = set(feature_names) if feature_names is not None else None
+    
+    def _guard_label(self, metric: str, value: str, use_allowlist: bool = True) -> str:
+        """
+        Return the label value to record for a client-controlled label
+        
+        Values outside the feature allowlist (if use_allowlist), or beyond
+        the series budget of the metric, are mapped to OVERFLOW_LABEL and
+        counted as rejected.
+        """
+        with self._series_lock:
+            series = self._series.setdefault(metric, set())
+            if value in series:
+                return value
+            if use_allowlist and self._label_allowlist is not None and value not in self._label_allowlist:
+                reason = "not_allowed"
+            elif len(series) >= self.max_series_per_metric:
+                reason = "budget_exceeded"
+            else:
+                series.add(value)
+                return value
+        
+        self.rejected_labels.labels(
+            model_name=self.model_name,
+            version=self.version,
+            metric=metric,
+            reason=reason
+        ).inc()
+        return OVERFLOW_LABEL
 
     def track_prediction(self, result: str = "success"):
         """Track a prediction count"""
@@ -73,17 +138,50 @@ class MLMetricsCollector:
         self.feature_values.labels(
             model_name=self.model_name,
             version=self.version,
-            feature_name=feature_name
+            feature_name=self._guard_label('model_feature_value', feature_name)
         ).set(value)
     
     def track_drift_score(self, feature_name: str, score: float, method: str = "ks_test"):
         """Track drift score for a feature"""
-        self.drift_score.labels(
-            model_name=self.model_name,
-            version=self.version,
-            feature_name=feature_name,
-            drift_method=method
-        ).set(score)
+        self.drift_collector.set_score(
+            self._guard_label('model_drift_score', feature_name), score, method
+        )
+    
+    def publish_drift(self, drift_result: Dict[str, Any]):
+        """Publish a drift result, exported when Prometheus scrapes"""
+        self.drift_collector.update(drift_result)
+    
+    def publish_segment_drift(self, segment_result: Dict[str, Any], max_segments: int = 50):
+        """
+        Publish a result of DriftDetector.detect_drift_segmented, exported
+        with segment labels when Prometheus scrapes
+        
+        At most max_segments segments (the first ones in the result, which
+        are the largest) are exported; the series budget of the metrics
+        collector also applies across segment columns. Segments over either
+        cap are dropped and counted as rejected labels.
+        """
+        segment_column = segment_result['segment_column']
+        segments = {}
+        for index, (segment, result) in enumerate(segment_result['segments'].items()):
+            if index >= max_segments:
+                self.rejected_labels.labels(
+                    model_name=self.model_name,
+                    version=self.version,
+                    metric='model_segment_drift',
+                    reason='segment_cap'
+                ).inc()
+                continue
+            label = self._guard_label(
+                'model_segment_drift', f"{segment_column}={segment}", use_allowlist=False
+            )
+            if label != OVERFLOW_LABEL:
+                segments[segment] = result
+        self.drift_collector.update_segments(segment_column, segments)
+    
+    def set_drift_source(self, source: Optional[Callable[[], Dict[str, Any]]]):
+        """Compute drift at scrape time by calling source()"""
+        self.drift_collector.set_source(source)
     
     def track_error(self, error_type: str):
         """Track a prediction error"""
@@ -92,3 +190,11 @@ class MLMetricsCollector:
             version=self.version,
             error_type=error_type
         ).inc()
+    
+    def track_cache_event(self, event: str, count: int = 1):
+        """Track prediction cache events (hit, miss, eviction, expired, invalidation)"""
+        self.cache_events.labels(
+            model_name=self.model_name,
+            version=self.version,
+            event=event
+        ).inc(count)
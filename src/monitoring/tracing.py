@@ -0,0 +1,280 @@
+# src/monitoring/tracing.py
+"""
+Sampled request tracing
+
+Each request is a trace made of nested spans (middleware, endpoint,
+validation, drift, registry calls). Traces are kept when they are chosen by
+head sampling (a random fraction decided when the request starts) or, with
+tail sampling, when the request turns out to be slow or fails. Kept traces
+go into a fixed-size ring buffer that the API exports at /debug/traces.
+
+Overhead on requests that are not kept:
+    - head sampling only: one ContextVar lookup per instrumented call
+    - with tail sampling: one small list append per span, dropped at the end
+      of the request
+
+Instrument code with the traced decorator or tracer.span():
+
+    @traced("schema.validate")
+    def validate(self, data): ...
+
+    with tracer.span("model.predict", rows=len(records)):
+        ...
+"""
+import inspect
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+# (trace, current span) of the request being handled, None when not tracing
+_current: ContextVar[Optional[tuple]] = ContextVar("mlops_trace", default=None)
+
+# Span layout: [name, parent span, start, end, error, attributes]
+_NAME, _PARENT, _START, _END, _ERROR, _ATTRIBUTES = range(6)
+
+
+class Trace:
+    """Spans recorded for one request"""
+    __slots__ = ("trace_id", "name", "start_time", "spans", "sampled",
+                 "error", "finished", "kept_reason", "dropped_spans")
+
+    def __init__(self, name: str, sampled: bool, attributes: Dict[str, Any]):
+        self.trace_id = None  # Assigned when the trace is kept
+        self.name = name
+        self.start_time = time.time()
+        self.spans: List[list] = [[name, None, time.perf_counter(), None, None, attributes]]
+        self.sampled = sampled
+        self.error = False
+        self.finished = False
+        self.kept_reason = None
+        self.dropped_spans = 0
+
+    @property
+    def root(self) -> list:
+        return self.spans[0]
+
+    @property
+    def duration(self) -> float:
+        root = self.root
+        end = root[_END] if root[_END] is not None else time.perf_counter()
+        return end - root[_START]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export the trace with span offsets and durations in milliseconds"""
+        origin = self.root[_START]
+        ids = {id(span): index for index, span in enumerate(self.spans)}
+        spans = []
+        for index, span in enumerate(self.spans):
+            end = span[_END]
+            spans.append({
+                "span_id": index,
+                "parent_id": ids.get(id(span[_PARENT])) if span[_PARENT] is not None else None,
+                "name": span[_NAME],
+                "start_offset_ms": (span[_START] - origin) * 1000,
+                "duration_ms": (end - span[_START]) * 1000 if end is not None else None,
+                "error": span[_ERROR],
+                "attributes": span[_ATTRIBUTES]
+            })
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": self.duration * 1000,
+            "kept_reason": self.kept_reason,
+            "error": self.error,
+            "dropped_spans": self.dropped_spans,
+            "spans": spans
+        }
+
+
+class _NoopSpan:
+    """Returned for requests that are not being recorded"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_error(self, error: str):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _SpanContext:
+    __slots__ = ("trace", "span", "token")
+
+    def __init__(self, trace: Trace, span: list):
+        self.trace = trace
+        self.span = span
+        self.token = None
+
+    def __enter__(self):
+        self.token = _current.set((self.trace, self.span))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span[_END] = time.perf_counter()
+        if exc_type is not None and self.span[_ERROR] is None:
+            self.span[_ERROR] = exc_type.__name__
+        _current.reset(self.token)
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        self.span[_ATTRIBUTES][key] = value
+
+    def set_error(self, error: str):
+        self.span[_ERROR] = error
+
+
+class _TraceContext(_SpanContext):
+    __slots__ = ("tracer",)
+
+    def __init__(self, tracer: "Tracer", trace: Trace):
+        super().__init__(trace, trace.root)
+        self.tracer = tracer
+
+    def __exit__(self, exc_type, exc, tb):
+        super().__exit__(exc_type, exc, tb)
+        if exc_type is not None:
+            self.trace.error = True
+        self.tracer._finish(self.trace)
+        return False
+
+    def set_error(self, error: str):
+        super().set_error(error)
+        self.trace.error = True
+
+
+class Tracer:
+    """
+    Records request traces into a ring buffer
+
+    Args:
+        sample_rate: Fraction of requests kept by head sampling
+        slow_threshold: Requests slower than this many seconds are always
+            kept when tail sampling is enabled
+        capacity: Number of traces kept in the ring buffer
+        tail_sampling: Record every request so slow and failed ones can be
+            kept after the fact
+        max_spans: Maximum spans recorded per trace
+    """
+    def __init__(self, sample_rate: float = 0.01, slow_threshold: float = 0.5,
+                 capacity: int = 1000, tail_sampling: bool = True, max_spans: int = 256):
+        self.enabled = True
+        self.max_spans = max_spans
+        self._buffer: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.configure(sample_rate=sample_rate, slow_threshold=slow_threshold,
+                       tail_sampling=tail_sampling)
+
+    def configure(self, enabled: Optional[bool] = None, sample_rate: Optional[float] = None,
+                  slow_threshold: Optional[float] = None, capacity: Optional[int] = None,
+                  tail_sampling: Optional[bool] = None):
+        """Update the tracer settings, resizing the buffer if capacity changes"""
+        if enabled is not None:
+            self.enabled = enabled
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        if slow_threshold is not None:
+            self.slow_threshold = slow_threshold
+        if tail_sampling is not None:
+            self.tail_sampling = tail_sampling
+        if capacity is not None and capacity != self._buffer.maxlen:
+            with self._lock:
+                self._buffer = deque(self._buffer, maxlen=capacity)
+
+    @property
+    def capacity(self) -> int:
+        return self._buffer.maxlen
+
+    def trace(self, name: str, **attributes):
+        """Start the root span of a request, returns a context manager"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not sampled and not self.tail_sampling:
+            return _NOOP_SPAN
+        return _TraceContext(self, Trace(name, sampled, attributes))
+
+    def span(self, name: str, **attributes):
+        """Start a child span of the current request, returns a context manager"""
+        current = _current.get()
+        if current is None:
+            return _NOOP_SPAN
+        trace, parent = current
+        if trace.finished or len(trace.spans) >= self.max_spans:
+            trace.dropped_spans += 1
+            return _NOOP_SPAN
+        span = [name, parent, time.perf_counter(), None, None, attributes]
+        trace.spans.append(span)
+        return _SpanContext(trace, span)
+
+    def _finish(self, trace: Trace):
+        trace.finished = True
+        if trace.sampled:
+            trace.kept_reason = "sampled"
+        elif trace.error:
+            trace.kept_reason = "error"
+        elif trace.duration >= self.slow_threshold:
+            trace.kept_reason = "slow"
+        else:
+            return
+        trace.trace_id = f"{random.getrandbits(64):016x}"
+        with self._lock:
+            self._buffer.append(trace)
+
+    def traces(self, limit: Optional[int] = None,
+               min_duration_ms: float = 0.0) -> List[Dict[str, Any]]:
+        """Kept traces, newest first"""
+        with self._lock:
+            traces = list(self._buffer)
+        result = []
+        for trace in reversed(traces):
+            if limit is not None and len(result) >= limit:
+                break
+            if trace.duration * 1000 >= min_duration_ms:
+                result.append(trace.to_dict())
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._buffer.clear()
+
+
+# Process-wide tracer, configured by the API at import time
+tracer = Tracer()
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator recording each call as a span of the current request"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _current.get() is None:
+                    return await func(*args, **kwargs)
+                with tracer.span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return func(*args, **kwargs)
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
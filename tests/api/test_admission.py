@@ -0,0 +1,57 @@
+# tests/api/test_admission.py
+import asyncio
+import unittest
+from src.api.admission import AdmissionController, AdmissionRejected
+
+class TestAdmissionController(unittest.IsolatedAsyncioTestCase):
+    
+    async def test_rejects_when_queue_full(self):
+        """Requests beyond the limit and the queue should be shed with 429"""
+        # Arrange
+        controller = AdmissionController(initial_limit=1, max_queue=1, queue_timeout=5)
+        await controller.acquire()
+        queued = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        
+        # Act / Assert
+        with self.assertRaises(AdmissionRejected) as ctx:
+            await controller.acquire()
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertGreaterEqual(ctx.exception.retry_after, 1)
+        
+        controller.release(0.01)
+        await queued
+        self.assertEqual(controller.in_flight, 1)
+    
+    async def test_queue_timeout(self):
+        """Requests waiting longer than the queue timeout should get 503"""
+        controller = AdmissionController(initial_limit=1, queue_timeout=0.01)
+        await controller.acquire()
+        
+        with self.assertRaises(AdmissionRejected) as ctx:
+            await controller.acquire()
+        
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertEqual(controller.queue_depth, 0)
+        self.assertEqual(controller.in_flight, 1)
+    
+    async def test_limit_adapts_to_latency(self):
+        """The limit should shrink on slow responses and grow when saturated and fast"""
+        controller = AdmissionController(initial_limit=10, latency_target=0.1)
+        
+        await controller.acquire()
+        controller.release(1.0)
+        self.assertLess(controller.limit, 10)
+        
+        controller = AdmissionController(initial_limit=2, latency_target=0.1)
+        for _ in range(2):
+            await controller.acquire()
+        controller.release(0.01)
+        self.assertGreater(controller.limit, 2)
+    
+    async def test_fast_path_without_contention(self):
+        controller = AdmissionController(initial_limit=4)
+        for _ in range(4):
+            await controller.acquire()
+        self.assertEqual(controller.in_flight, 4)
+        self.assertEqual(controller.queue_depth, 0)
@@ -0,0 +1,75 @@
+# tests/api/test_cache.py
+import unittest
+from unittest.mock import MagicMock, patch
+from src.api.cache import PredictionCache
+
+FEATURES = {"feature1": 0.5, "feature2": 1.0, "feature3": "category_a"}
+
+class TestPredictionCache(unittest.TestCase):
+    
+    def test_key_is_canonical(self):
+        """Key order of the features should not change the cache key"""
+        reordered = {"feature3": "category_a", "feature2": 1.0, "feature1": 0.5}
+        self.assertEqual(
+            PredictionCache.make_key(FEATURES, "model", "1"),
+            PredictionCache.make_key(reordered, "model", "1")
+        )
+        self.assertNotEqual(
+            PredictionCache.make_key(FEATURES, "model", "1"),
+            PredictionCache.make_key(FEATURES, "model", "2")
+        )
+    
+    def test_hit_and_miss_are_tracked(self):
+        # Arrange
+        metrics = MagicMock()
+        cache = PredictionCache(metrics=metrics)
+        
+        # Act
+        first = cache.get(FEATURES, "model", "1")
+        cache.put(FEATURES, "model", "1", (1, 0.85))
+        second = cache.get(FEATURES, "model", "1")
+        
+        # Assert
+        self.assertIsNone(first)
+        self.assertEqual(second, (1, 0.85))
+        metrics.track_cache_event.assert_any_call("miss", 1)
+        metrics.track_cache_event.assert_any_call("hit", 1)
+    
+    def test_lru_eviction_by_count(self):
+        """The least recently used entry should be evicted first"""
+        cache = PredictionCache(max_entries=2)
+        cache.put({"x": 1}, "model", "1", 1)
+        cache.put({"x": 2}, "model", "1", 2)
+        cache.get({"x": 1}, "model", "1")
+        cache.put({"x": 3}, "model", "1", 3)
+        
+        self.assertEqual(cache.get({"x": 1}, "model", "1"), 1)
+        self.assertIsNone(cache.get({"x": 2}, "model", "1"))
+        self.assertEqual(len(cache), 2)
+    
+    def test_eviction_by_memory(self):
+        """Entries should be evicted when the memory budget is exceeded"""
+        cache = PredictionCache(max_bytes=1000)
+        for i in range(20):
+            cache.put({"x": i}, "model", "1", i)
+        
+        self.assertLessEqual(cache.size_bytes, 1000)
+        self.assertLess(len(cache), 20)
+    
+    def test_ttl_expiry(self):
+        cache = PredictionCache(ttl=10)
+        with patch("src.api.cache.time.time", return_value=100):
+            cache.put(FEATURES, "model", "1", (1, 0.85))
+        with patch("src.api.cache.time.time", return_value=111):
+            self.assertIsNone(cache.get(FEATURES, "model", "1"))
+        self.assertEqual(len(cache), 0)
+    
+    def test_version_change_invalidates(self):
+        """Switching model versions should drop all cached entries"""
+        metrics = MagicMock()
+        cache = PredictionCache(metrics=metrics)
+        cache.put(FEATURES, "model", "1", (1, 0.85))
+        
+        self.assertIsNone(cache.get(FEATURES, "model", "2"))
+        self.assertEqual(len(cache), 0)
+        metrics.track_cache_event.assert_any_call("invalidation", 1)
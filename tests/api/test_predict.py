@@ -0,0 +1,211 @@
+# tests/api/test_predict.py
+import json
+import threading
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from src.api import main
+from src.data_validation.schema import DataSchemaValidator
+from src.data_validation.drift import DriftDetector
+from src.api.cache import PredictionCache
+
+SCHEMA = {
+    "features": {
+        "feature1": {"type": "numeric", "required": True, "range": [-10, 10]},
+        "feature2": {"type": "numeric", "required": True},
+        "feature3": {"type": "categorical", "required": False}
+    }
+}
+
+def load_test_components():
+    """Install in-memory components in place of the startup loaders"""
+    rng = np.random.default_rng(0)
+    main.model = "placeholder"
+    main.validator = DataSchemaValidator(schema=SCHEMA)
+    main.drift_detector = DriftDetector(pd.DataFrame({
+        "feature1": rng.normal(0, 1, 200),
+        "feature2": rng.normal(1, 0.5, 200),
+        "feature3": rng.choice(["category_a", "category_b"], 200)
+    }))
+    main.drift_window = main.drift_detector.create_window(max_size=100)
+    main.prediction_cache = None
+
+class TestPredictEndpoints(unittest.TestCase):
+    
+    def setUp(self):
+        load_test_components()
+        self.client = TestClient(main.app)
+    
+    def test_predict(self):
+        response = self.client.post("/predict", json={
+            "features": {"feature1": 0.5, "feature2": 1.0, "feature3": "category_a"},
+            "request_id": "test-123"
+        })
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["request_id"], "test-123")
+    
+    def test_batch_scores_valid_rows_and_reports_invalid(self):
+        """Invalid rows should be reported without rejecting the batch"""
+        response = self.client.post("/predict/batch", json={
+            "records": [
+                {"feature1": 0.5, "feature2": 1.0},
+                {"feature1": 50.0, "feature2": 1.0},
+                {"feature2": 1.0}
+            ]
+        })
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIsNotNone(data["predictions"][0])
+        self.assertIsNone(data["predictions"][1])
+        self.assertEqual(
+            data["rejected"],
+            [
+                {"row": 1, "errors": {"feature1": ["range"]}},
+                {"row": 2, "errors": {"feature1": ["missing"]}}
+            ]
+        )
+    
+    def test_not_ready(self):
+        """Predictions should be refused until components are loaded"""
+        main.drift_detector = None
+        response = self.client.post("/predict", json={"features": {"feature1": 0.5}})
+        self.assertEqual(response.status_code, 503)
+    
+    def test_cached_predictions_skip_scoring(self):
+        """Repeated feature vectors should be answered from the cache"""
+        main.prediction_cache = PredictionCache()
+        payload = {"features": {"feature1": 0.5, "feature2": 1.0}}
+        
+        self.client.post("/predict", json=payload)
+        window_size = len(main.drift_window)
+        response = self.client.post("/predict", json=payload)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(main.drift_window), window_size)
+        self.assertEqual(len(main.prediction_cache), 1)
+    
+    def test_overload_is_shed_with_retry_after(self):
+        """Requests should be rejected immediately when no slot or queue space is left"""
+        controller = main.admission_controller
+        in_flight, max_queue = controller.in_flight, controller.max_queue
+        controller.in_flight, controller.max_queue = controller.current_limit, 0
+        try:
+            response = self.client.post("/predict", json={"features": {"feature1": 0.5}})
+        finally:
+            controller.in_flight, controller.max_queue = in_flight, max_queue
+        
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response.headers)
+    
+    def test_admission_gauges_are_read_at_scrape_time(self):
+        """Admission gauges should reflect the controller when /metrics is scraped"""
+        controller = main.admission_controller
+        in_flight = controller.in_flight
+        controller.in_flight = in_flight + 7
+        try:
+            response = self.client.get("/metrics")
+        finally:
+            controller.in_flight = in_flight
+        
+        self.assertIn(f"api_admission_in_flight {float(in_flight + 7)}", response.text)
+        self.assertIn(f"api_admission_concurrency_limit {float(controller.current_limit)}", response.text)
+    
+    def test_drift_metrics_are_computed_at_scrape_time(self):
+        """Drift metrics should come from the window when /metrics is scraped"""
+        main.metrics.set_drift_source(
+            lambda: main.drift_detector.detect_drift_window(main.drift_window)
+        )
+        try:
+            self.client.post("/predict", json={"features": {"feature1": 0.5, "feature2": 1.0}})
+            response = self.client.get("/metrics")
+        finally:
+            main.metrics.set_drift_source(None)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('model_drift_window_size{model_name="example_model",version="1"} 1.0', response.text)
+        self.assertIn("model_drift_score", response.text)
+    
+    def test_sampled_request_trace_is_exported(self):
+        """A sampled prediction should be exported with its component spans"""
+        sample_rate = main.tracer.sample_rate
+        main.tracer.configure(sample_rate=1.0)
+        main.tracer.clear()
+        local_client = TestClient(main.app, client=("127.0.0.1", 50000))
+        try:
+            with patch.object(main, "TRACE_EXPORT_ENABLED", True):
+                local_client.post("/predict", json={"features": {"feature1": 0.5, "feature2": 1.0}})
+                response = local_client.get("/debug/traces", params={"limit": 1})
+        finally:
+            main.tracer.configure(sample_rate=sample_rate)
+            main.tracer.clear()
+        
+        self.assertEqual(response.status_code, 200)
+        [trace] = response.json()["traces"]
+        self.assertEqual(trace["name"], "POST /predict")
+        self.assertEqual(
+            [span["name"] for span in trace["spans"]],
+            ["POST /predict", "predict", "schema.validate", "score_records", "model.predict"]
+        )
+    
+    def test_trace_export_is_opt_in_and_local(self):
+        """Traces should only be served when enabled, and only to loopback clients"""
+        self.assertEqual(self.client.get("/debug/traces").status_code, 404)
+        
+        with patch.object(main, "TRACE_EXPORT_ENABLED", True):
+            remote = TestClient(main.app, client=("203.0.113.7", 50000))
+            self.assertEqual(remote.get("/debug/traces").status_code, 403)
+    
+    def test_ndjson_stream_returns_results_in_order(self):
+        """Each streamed record should get its own result line, in order"""
+        body = "\n".join([
+            json.dumps({"features": {"feature1": 0.5, "feature2": 1.0}, "request_id": "a"}),
+            json.dumps({"features": {"feature1": 50.0, "feature2": 1.0}, "request_id": "b"}),
+            "not json",
+            json.dumps({"features": {"feature1": 0.1, "feature2": 1.0}, "request_id": "d"})
+        ]) + "\n"
+        
+        responses = []
+        request = threading.Thread(target=lambda: responses.append(self.client.post(
+            "/predict/stream", content=body, headers={"Content-Type": "application/x-ndjson"}
+        )), daemon=True)
+        request.start()
+        request.join(timeout=10)
+        
+        self.assertFalse(request.is_alive(), "NDJSON stream did not complete")
+        response = responses[0]
+        self.assertEqual(response.status_code, 200)
+        results = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[0]["request_id"], "a")
+        self.assertIn("prediction", results[0])
+        self.assertEqual(results[1]["error"], {"validation": {"feature1": ["range"]}})
+        self.assertIn("Invalid JSON", results[2]["error"])
+        self.assertEqual(results[3]["request_id"], "d")
+    
+    def test_websocket_stream(self):
+        """Predictions should be returned over a single WebSocket connection"""
+        with self.client.websocket_connect("/predict/stream") as websocket:
+            for i in range(3):
+                websocket.send_text(json.dumps({
+                    "features": {"feature1": i * 0.1, "feature2": 1.0},
+                    "request_id": str(i)
+                }))
+            results = [json.loads(websocket.receive_text()) for _ in range(3)]
+        
+        self.assertEqual([r["request_id"] for r in results], ["0", "1", "2"])
+        self.assertTrue(all("prediction" in r for r in results))
+    
+    def test_websocket_processing_error_closes_with_1011(self):
+        """A failure while scoring should close the stream with an error code"""
+        with patch.object(main, "predict_stream_batch", side_effect=RuntimeError("boom")):
+            with self.client.websocket_connect("/predict/stream") as websocket:
+                websocket.send_text(json.dumps({"features": {"feature1": 0.5, "feature2": 1.0}}))
+                with self.assertRaises(WebSocketDisconnect) as ctx:
+                    websocket.receive_text()
+        
+        self.assertEqual(ctx.exception.code, 1011)
@@ -0,0 +1,45 @@
+# tests/api/test_startup.py
+import threading
+import unittest
+from src.api.startup import StartupState, READY, FAILED
+
+class TestStartupState(unittest.TestCase):
+    
+    def test_stages_run_in_parallel(self):
+        """Stages should run concurrently rather than one after another"""
+        # Arrange
+        barrier = threading.Barrier(2, timeout=5)
+        state = StartupState(["a", "b"])
+        
+        # Act
+        state.start({"a": barrier.wait, "b": barrier.wait})
+        
+        # Assert
+        self.assertTrue(state.wait(timeout=5))
+        self.assertEqual(state.snapshot()["a"]["status"], READY)
+        self.assertIn("duration_ms", state.snapshot()["b"])
+    
+    def test_failed_stage_is_reported(self):
+        """A failing loader should mark only its own stage as failed"""
+        # Arrange
+        state = StartupState(["good", "bad"])
+        
+        def fail():
+            raise ValueError("boom")
+        
+        # Act
+        state.start({"good": lambda: None, "bad": fail})
+        state.wait(timeout=5)
+        
+        # Assert
+        snapshot = state.snapshot()
+        self.assertEqual(snapshot["bad"]["status"], FAILED)
+        self.assertEqual(snapshot["bad"]["error"], "boom")
+        self.assertTrue(state.is_ready("good"))
+        self.assertFalse(state.is_ready())
+    
+    def test_not_ready_before_start(self):
+        """Stages should be pending until started"""
+        state = StartupState(["model"])
+        self.assertFalse(state.is_ready())
+        self.assertEqual(state.snapshot()["model"]["status"], "pending")
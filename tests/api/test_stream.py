@@ -0,0 +1,79 @@
+# tests/api/test_stream.py
+import asyncio
+import unittest
+from src.api.stream import ndjson_records, stream_batches
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+class TestStreamBatches(unittest.IsolatedAsyncioTestCase):
+    
+    async def test_ndjson_lines_split_across_chunks(self):
+        """Records split over chunk boundaries should be reassembled"""
+        records = await collect(ndjson_records(chunks(b'{"a": 1}\n{"a"', b': 2}\n\n{"a": 3}')))
+        self.assertEqual(records, [{"a": 1}, {"a": 2}, {"a": 3}])
+    
+    async def test_oversized_records_are_rejected_in_order(self):
+        """A line over the size limit should yield one error and not be buffered"""
+        records = await collect(ndjson_records(
+            chunks(b'{"a": 1}\n{"a": "', b'x' * 50, b'x' * 50, b'"}\n{"a": 2}'),
+            max_record_bytes=32
+        ))
+        
+        self.assertEqual(records[0], {"a": 1})
+        self.assertIn("error", records[1])
+        self.assertEqual(records[2], {"a": 2})
+        self.assertEqual(len(records), 3)
+    
+    async def test_results_are_in_order_and_batched(self):
+        """Records should be micro-batched without reordering results"""
+        batch_sizes = []
+        
+        def process(batch):
+            batch_sizes.append(len(batch))
+            return [item * 10 for item in batch]
+        
+        async def records():
+            for i in range(20):
+                yield i
+        
+        results = await collect(stream_batches(records(), process, max_batch=8, max_pending=16))
+        
+        self.assertEqual(results, [i * 10 for i in range(20)])
+        self.assertTrue(all(size <= 8 for size in batch_sizes))
+        self.assertEqual(sum(batch_sizes), 20)
+    
+    async def test_reader_is_bounded(self):
+        """The reader should not run ahead of processing by more than max_pending"""
+        read = []
+        
+        async def records():
+            for i in range(100):
+                read.append(i)
+                yield i
+        
+        stream = stream_batches(records(), lambda batch: batch, max_batch=1, max_pending=4)
+        first = await stream.__anext__()
+        await asyncio.sleep(0.01)
+        
+        self.assertEqual(first, 0)
+        self.assertLessEqual(len(read), 1 + 4 + 2)
+        await stream.aclose()
+    
+    async def test_closing_with_full_queue_leaves_no_task(self):
+        """Aborting the consumer under backpressure should stop the reader"""
+        async def records():
+            for i in range(100):
+                yield i
+        
+        stream = stream_batches(records(), lambda batch: batch, max_batch=1, max_pending=2)
+        await stream.__anext__()
+        await asyncio.sleep(0.01)  # Let the reader fill the queue
+        
+        await stream.aclose()
+        
+        self.assertEqual(asyncio.all_tasks() - {asyncio.current_task()}, set())
@@ -0,0 +1,157 @@
+# tests/data_validation/test_drift.py
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.data_validation.drift import DriftDetector, DriftBudget
+from src.data_validation.profile import ReferenceProfile
+
+class TestApproximateDrift(unittest.TestCase):
+    
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.reference = pd.DataFrame({
+            "feature1": rng.normal(0, 1, 50000),
+            "feature2": rng.normal(0, 1, 50000)
+        })
+        self.current = pd.DataFrame({
+            "feature1": rng.normal(0.5, 1, 20000),
+            "feature2": rng.normal(0, 1, 20000)
+        })
+        self.detector = DriftDetector(self.reference)
+    
+    def test_interval_contains_exact_statistic(self):
+        """The confidence interval should cover the exact KS statistic"""
+        exact = self.detector.detect_drift(self.current)
+        approx = self.detector.detect_drift(
+            self.current, budget=DriftBudget(max_samples=2000, seed=0)
+        )
+        
+        for col in ("feature1", "feature2"):
+            low, high = approx["feature_drifts"][col]["confidence_interval"]
+            self.assertLessEqual(low, exact["feature_drifts"][col]["statistic"])
+            self.assertGreaterEqual(high, exact["feature_drifts"][col]["statistic"])
+            self.assertEqual(approx["feature_drifts"][col]["sample_sizes"]["current"], 2000)
+        self.assertEqual(approx["flagged_features"], ["feature1"])
+        self.assertTrue(approx["approximate"])
+    
+    def test_time_limit_skips_features(self):
+        """Features not reached within the time limit should be reported as skipped"""
+        result = self.detector.detect_drift(self.current, budget=DriftBudget(time_limit=0))
+        
+        self.assertTrue(result["budget_exhausted"])
+        self.assertEqual(result["skipped_features"], ["feature1", "feature2"])
+    
+    def test_time_limit_alone_subsamples(self):
+        """A time limit without max_samples should still derive a sample cap"""
+        result = self.detector.detect_drift(
+            self.current, budget=DriftBudget(time_limit=0.001, seed=0)
+        )
+        
+        self.assertLess(result["sample_cap"], len(self.current))
+        for drift_info in result["feature_drifts"].values():
+            self.assertLessEqual(drift_info["sample_sizes"]["current"], result["sample_cap"])
+            self.assertIn("confidence_interval", drift_info)
+    
+    def test_categorical_interval_contains_exact_statistic(self):
+        rng = np.random.default_rng(5)
+        detector = DriftDetector(pd.DataFrame({"tier": rng.choice(["a", "b", "c"], 20000)}))
+        current = pd.DataFrame({"tier": rng.choice(["a", "b", "c"], 20000, p=[0.5, 0.3, 0.2])})
+        
+        exact = detector.detect_drift(current)["feature_drifts"]["tier"]["statistic"]
+        approx = detector.detect_drift(
+            current, budget=DriftBudget(max_samples=2000, seed=0)
+        )["feature_drifts"]["tier"]
+        
+        low, high = approx["confidence_interval"]
+        self.assertLessEqual(low, exact)
+        self.assertGreaterEqual(high, exact)
+    
+    def test_budget_requires_a_limit(self):
+        with self.assertRaises(ValueError):
+            DriftBudget()
+
+
+class TestSegmentedDrift(unittest.TestCase):
+    
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.reference = pd.DataFrame({
+            "region": rng.choice(["eu", "us", "apac"], 30000),
+            "tier": rng.choice(["free", "gold"], 30000),
+            "feature1": rng.normal(0, 1, 30000)
+        })
+        self.current = self.reference.sample(9000, random_state=2).reset_index(drop=True)
+        self.current.loc[self.current["region"] == "eu", "feature1"] += 0.5
+        self.current.loc[self.current["region"] == "us", "tier"] = "gold"
+        self.detector = DriftDetector(self.reference)
+    
+    def test_drift_is_attributed_to_segments(self):
+        """Only the segments whose data changed should be flagged"""
+        result = self.detector.detect_drift_segmented(self.current, "region")
+        
+        self.assertEqual(set(result["segments"]), {"eu", "us", "apac"})
+        self.assertEqual(result["segments"]["eu"]["flagged_features"], ["feature1"])
+        self.assertEqual(result["segments"]["us"]["flagged_features"], ["tier"])
+        self.assertFalse(result["segments"]["apac"]["drift_detected"])
+        self.assertEqual(sorted(result["flagged_segments"]), ["eu", "us"])
+        self.assertNotIn("region", result["segments"]["eu"]["feature_drifts"])
+    
+    def test_matches_per_segment_window_detection(self):
+        """Grouped statistics should equal detecting drift on each slice separately"""
+        result = self.detector.detect_drift_segmented(self.current, "region")
+        
+        for region in ("eu", "apac"):
+            segment_detector = DriftDetector(self.reference[self.reference["region"] == region])
+            window = self.detector.create_window()
+            for record in self.current[self.current["region"] == region].to_dict("records"):
+                window.add(record)
+            # Per-segment reference counts use the global reference bin edges
+            expected = self.detector._binned_ks_test(
+                np.histogram(segment_detector.profile.sorted_values("feature1"),
+                             bins=self.detector.profile.histogram("feature1")[1])[0],
+                window.snapshot()["feature1"]
+            )
+            actual = result["segments"][region]["feature_drifts"]["feature1"]
+            self.assertAlmostEqual(actual["statistic"], expected[0])
+            self.assertAlmostEqual(actual["p_value"], expected[1])
+    
+    def test_reference_profiles_are_computed_once(self):
+        self.detector.detect_drift_segmented(self.current, "region")
+        reference = self.detector._segment_reference("region")
+        self.detector.detect_drift_segmented(self.current, "region")
+        
+        self.assertIs(self.detector._segment_reference("region"), reference)
+    
+    def test_segment_cap_and_unknown_segments(self):
+        """Only the largest segments are evaluated and unseen segments are reported"""
+        current = self.current.copy()
+        current.loc[:4, "region"] = "mars"
+        
+        result = self.detector.detect_drift_segmented(current, "region", max_segments=2)
+        
+        self.assertEqual(len(result["segments"]), 2)
+        self.assertEqual(result["truncated_segments"], 1)
+        self.assertEqual(result["unknown_segments"], ["mars"])
+    
+    def test_segmented_drift_on_loaded_profile(self):
+        """Segment counts stored in a profile file should need no reference data"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "reference_profile.bin")
+            ReferenceProfile.from_dataframe(self.reference, segment_columns=["region"]).save(path)
+            detector = DriftDetector.from_profile(path)
+            
+            result = detector.detect_drift_segmented(self.current, "region")
+        
+        expected = self.detector.detect_drift_segmented(self.current, "region")
+        self.assertIsNone(detector.reference_data)
+        self.assertEqual(sorted(result["flagged_segments"]), ["eu", "us"])
+        self.assertEqual(
+            result["segments"]["eu"]["feature_drifts"], expected["segments"]["eu"]["feature_drifts"]
+        )
+    
+    def test_requires_reference_segment_column(self):
+        detector = DriftDetector(self.reference.drop(columns=["region"]))
+        with self.assertRaises(ValueError):
+            detector.detect_drift_segmented(self.current, "region")
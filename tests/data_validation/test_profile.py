@@ -0,0 +1,77 @@
+# tests/data_validation/test_profile.py
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.data_validation.profile import ReferenceProfile, MAGIC
+from src.data_validation.drift import DriftDetector
+
+class TestReferenceProfile(unittest.TestCase):
+    
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.reference = pd.DataFrame({
+            "feature1": rng.normal(0, 1, 500),
+            "feature2": rng.integers(0, 10, 500),
+            "feature3": rng.choice(["category_a", "category_b"], 500)
+        })
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "reference_profile.bin")
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_round_trip(self):
+        """A saved profile should load back with identical arrays and statistics"""
+        # Arrange
+        profile = ReferenceProfile.from_dataframe(self.reference)
+        
+        # Act
+        profile.save(self.path)
+        loaded = ReferenceProfile.load(self.path)
+        
+        # Assert
+        np.testing.assert_array_equal(
+            loaded.sorted_values("feature1"), np.sort(self.reference["feature1"])
+        )
+        np.testing.assert_array_equal(loaded.histogram("feature2")[0], profile.histogram("feature2")[0])
+        self.assertAlmostEqual(loaded.numeric["feature1"]["stats"]["mean"], self.reference["feature1"].mean())
+        self.assertEqual(loaded.categorical_columns, ["feature3"])
+        self.assertAlmostEqual(sum(loaded.statistics()["feature3"]["value_counts"].values()), 1.0)
+    
+    def test_loaded_arrays_are_read_only(self):
+        """Memory-mapped arrays must not be writable"""
+        ReferenceProfile.from_dataframe(self.reference).save(self.path)
+        loaded = ReferenceProfile.load(self.path)
+        self.assertFalse(loaded.sorted_values("feature1").flags.writeable)
+    
+    def test_rejects_unknown_files(self):
+        """Loading a file that is not a profile should fail clearly"""
+        with open(self.path, "wb") as f:
+            f.write(b"not a profile at all, just some bytes")
+        with self.assertRaises(ValueError):
+            ReferenceProfile.load(self.path)
+    
+    def test_header_starts_with_magic(self):
+        """The file format should be identifiable from its first bytes"""
+        ReferenceProfile.from_dataframe(self.reference).save(self.path)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(len(MAGIC)), MAGIC)
+    
+    def test_detector_from_profile_matches_dataframe(self):
+        """Drift results should not depend on how the reference was loaded"""
+        # Arrange
+        ReferenceProfile.from_dataframe(self.reference).save(self.path)
+        current = self.reference.assign(feature1=self.reference["feature1"] + 1.0)
+        
+        # Act
+        from_profile = DriftDetector.from_profile(self.path).detect_drift(current)
+        from_dataframe = DriftDetector(self.reference).detect_drift(current)
+        
+        # Assert
+        self.assertEqual(from_profile["flagged_features"], from_dataframe["flagged_features"])
+        self.assertAlmostEqual(
+            from_profile["feature_drifts"]["feature1"]["statistic"],
+            from_dataframe["feature_drifts"]["feature1"]["statistic"]
+        )
@@ -0,0 +1,88 @@
+# tests/data_validation/test_schema.py
+import unittest
+import numpy as np
+import pandas as pd
+from src.data_validation.schema import DataSchemaValidator, ROW_MISSING, ROW_TYPE, ROW_RANGE
+
+SCHEMA = {
+    "features": {
+        "feature1": {"type": "numeric", "required": True, "range": [0, 1]},
+        "feature2": {"type": "numeric", "required": False},
+        "feature3": {"type": "categorical", "required": True}
+    }
+}
+
+class TestRowValidation(unittest.TestCase):
+    
+    def setUp(self):
+        self.validator = DataSchemaValidator(schema=SCHEMA)
+    
+    def test_error_codes_per_row(self):
+        """Each row should get its own missing, type and range flags"""
+        # Arrange
+        data = pd.DataFrame({
+            "feature1": [0.5, 2.0, None, 0.1],
+            "feature2": [1.0, 1.0, 1.0, "abc"],
+            "feature3": ["a", "b", "c", None]
+        })
+        
+        # Act
+        result = self.validator.validate_rows(data)
+        
+        # Assert
+        np.testing.assert_array_equal(result.valid_mask, [True, False, False, False])
+        self.assertEqual(result.error_codes[1], ROW_RANGE)
+        self.assertEqual(result.error_codes[2], ROW_MISSING)
+        self.assertEqual(result.error_codes[3], ROW_TYPE | ROW_MISSING)
+        self.assertEqual(result.num_invalid, 3)
+    
+    def test_valid_rows_can_be_scored(self):
+        """A few bad rows should not reject the whole batch"""
+        data = pd.DataFrame({
+            "feature1": np.linspace(0, 1.5, 100),
+            "feature3": ["a"] * 100
+        })
+        
+        result = self.validator.validate_rows(data)
+        
+        self.assertFalse(self.validator.validate(data)["valid"])
+        self.assertEqual(len(result.valid_rows(data)), 67)
+        self.assertEqual(len(result.invalid_rows(data)), 33)
+        self.assertEqual(result.report(max_rows=1)[0]["errors"], {"feature1": ["range"]})
+    
+    def test_missing_required_column(self):
+        """A missing required column should flag every row"""
+        data = pd.DataFrame({"feature1": [0.5, 0.6]})
+        
+        result = self.validator.validate_rows(data)
+        
+        self.assertFalse(result.valid_mask.any())
+        self.assertEqual(result.report()[0]["errors"], {"feature3": ["missing"]})
+    
+    def test_numeric_strings_and_bools_are_type_errors(self):
+        """Row flags should agree with validate(), which rejects these columns"""
+        data = pd.DataFrame({
+            "feature1": [0.5, "0.5", True, np.int64(1)],
+            "feature2": [True, False, None, True],
+            "feature3": ["a", "b", "c", "d"]
+        })
+        
+        result = self.validator.validate_rows(data)
+        
+        self.assertFalse(self.validator.validate(data)["valid"])
+        np.testing.assert_array_equal(
+            result.error_codes, [ROW_TYPE, ROW_TYPE, ROW_TYPE, ROW_TYPE]
+        )
+        self.assertEqual(
+            result.report()[1]["errors"], {"feature1": ["type"], "feature2": ["type"]}
+        )
+        self.assertEqual(result.report()[3]["errors"], {"feature2": ["type"]})
+    
+    def test_bool_columns_are_rejected_by_both_validators(self):
+        """A pure bool column should fail validate() and flag every row"""
+        data = pd.DataFrame({"feature1": [True, False], "feature3": ["a", "b"]})
+        
+        result = self.validator.validate_rows(data)
+        
+        self.assertEqual(self.validator.validate(data)["type_errors"], ["feature1"])
+        np.testing.assert_array_equal(result.error_codes, [ROW_TYPE, ROW_TYPE])
@@ -0,0 +1,58 @@
+# tests/data_validation/test_shared.py
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from src.data_validation.profile import ReferenceProfile
+from src.data_validation.shared import attach_shared_profile, shared_profile_path
+
+class TestSharedProfile(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmpdir.name, "reference_data.csv")
+        rng = np.random.default_rng(0)
+        pd.DataFrame({
+            "feature1": rng.normal(0, 1, 300),
+            "feature3": rng.choice(["category_a", "category_b"], 300)
+        }).to_csv(self.csv_path, index=False)
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_profile_is_built_once_for_all_workers(self):
+        """Concurrent workers should build the shared profile only once"""
+        build = ReferenceProfile.from_dataframe
+        with patch.object(ReferenceProfile, "from_dataframe", side_effect=build) as mock_build:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                profiles = list(pool.map(
+                    lambda _: attach_shared_profile(
+                        "model-1", reference_csv=self.csv_path, shared_dir=self.tmpdir.name
+                    ),
+                    range(4)
+                ))
+        
+        self.assertEqual(mock_build.call_count, 1)
+        self.assertTrue(os.path.exists(shared_profile_path("model-1", self.tmpdir.name)))
+        for profile in profiles:
+            self.assertEqual(len(profile.sorted_values("feature1")), 300)
+            self.assertFalse(profile.sorted_values("feature1").flags.writeable)
+    
+    def test_precompiled_profile_is_mapped_directly(self):
+        """An existing profile should be used without building a shared copy"""
+        profile_path = os.path.join(self.tmpdir.name, "reference_profile.bin")
+        ReferenceProfile.from_dataframe(pd.read_csv(self.csv_path)).save(profile_path)
+        
+        profile = attach_shared_profile(
+            "model-1", profile_path=profile_path, shared_dir=self.tmpdir.name
+        )
+        
+        self.assertEqual(profile.categorical_columns, ["feature3"])
+        self.assertFalse(os.path.exists(shared_profile_path("model-1", self.tmpdir.name)))
+    
+    def test_requires_a_source(self):
+        with self.assertRaises(ValueError):
+            attach_shared_profile("model-1", shared_dir=self.tmpdir.name)
@@ -0,0 +1,139 @@
+# tests/data_validation/test_streaming.py
+import unittest
+import numpy as np
+import pandas as pd
+from src.data_validation.streaming import RunningStatistics, SlidingWindowStatistics
+from src.data_validation.drift import DriftDetector
+
+class TestRunningStatistics(unittest.TestCase):
+    
+    def setUp(self):
+        self.values = np.random.default_rng(0).normal(5, 2, 200)
+        self.edges = np.histogram(self.values, bins=10)[1]
+    
+    def test_matches_batch_statistics(self):
+        """Incremental statistics should match the batch computation"""
+        running = RunningStatistics(self.edges)
+        for value in self.values:
+            running.add(value)
+        
+        self.assertAlmostEqual(running.mean, self.values.mean())
+        self.assertAlmostEqual(running.std, pd.Series(self.values).std())
+        self.assertEqual(running.min, self.values.min())
+        self.assertEqual(running.max, self.values.max())
+        np.testing.assert_array_equal(running.hist_counts, np.histogram(self.values, bins=self.edges)[0])
+    
+    def test_remove_reverses_add(self):
+        """Removing values should leave the statistics of the remaining values"""
+        running = RunningStatistics(self.edges)
+        for value in self.values:
+            running.add(value)
+        for value in self.values[:50]:
+            running.remove(value)
+        
+        self.assertEqual(running.count, 150)
+        self.assertAlmostEqual(running.mean, self.values[50:].mean())
+        self.assertAlmostEqual(running.variance, self.values[50:].var(ddof=1))
+        np.testing.assert_array_equal(running.hist_counts, np.histogram(self.values[50:], bins=self.edges)[0])
+    
+    def test_merge(self):
+        """Merging two accumulators should equal accumulating everything"""
+        left, right = RunningStatistics(self.edges), RunningStatistics(self.edges)
+        for value in self.values[:80]:
+            left.add(value)
+        for value in self.values[80:]:
+            right.add(value)
+        
+        merged = left.merge(right)
+        
+        self.assertEqual(merged.count, 200)
+        self.assertAlmostEqual(merged.mean, self.values.mean())
+        self.assertAlmostEqual(merged.variance, self.values.var(ddof=1))
+        self.assertEqual(sum(merged.hist_counts), 200)
+    
+    def test_out_of_range_values(self):
+        """Values outside the reference bins go to underflow and overflow"""
+        running = RunningStatistics([0.0, 1.0, 2.0])
+        for value in (-1.0, 0.5, 2.0, 3.0):
+            running.add(value)
+        
+        self.assertEqual(running.underflow, 1)
+        self.assertEqual(running.overflow, 1)
+        self.assertEqual(running.hist_counts, [1, 1])
+
+
+class TestSlidingWindowStatistics(unittest.TestCase):
+    
+    def test_window_evicts_oldest(self):
+        """A bounded window should only reflect the most recent records"""
+        window = SlidingWindowStatistics({"x": [0, 5, 10]}, categorical_columns=["c"], max_size=3)
+        for i, category in zip(range(6), "aabbbb"):
+            window.add({"x": float(i), "c": category})
+        
+        stats = window.snapshot()["x"]
+        self.assertEqual(len(window), 3)
+        self.assertAlmostEqual(stats.mean, 4.0)
+        self.assertEqual((stats.min, stats.max), (3.0, 5.0))
+        self.assertEqual(window.value_counts("c", normalize=False), {"b": 3})
+    
+    def test_expire_by_age(self):
+        """Records older than max_age should be removed on expire"""
+        now = [105.0]
+        window = SlidingWindowStatistics({"x": [0, 10]}, max_age=10, clock=lambda: now[0])
+        window.add({"x": 1.0}, timestamp=100)
+        window.add({"x": 9.0}, timestamp=105)
+        
+        removed = window.expire(now=112)
+        
+        self.assertEqual(removed, 1)
+        self.assertEqual(window.snapshot()["x"].min, 9.0)
+    
+    def test_old_records_expire_without_explicit_expire(self):
+        """Window drift should not include records older than max_age"""
+        rng = np.random.default_rng(2)
+        detector = DriftDetector(pd.DataFrame({"feature1": rng.normal(0, 1, 1000)}))
+        now = [1000.0]
+        window = detector.create_window(max_age=60, clock=lambda: now[0])
+        for value in rng.normal(3, 1, 200):
+            window.add({"feature1": value})
+        
+        now[0] += 30
+        self.assertTrue(detector.detect_drift_window(window)["drift_detected"])
+        
+        now[0] += 60
+        for value in rng.normal(0, 1, 200):
+            window.add({"feature1": value})
+        result = detector.detect_drift_window(window)
+        
+        self.assertEqual(result["window_size"], 200)
+        self.assertFalse(result["drift_detected"])
+        
+        now[0] += 120
+        self.assertEqual(window.snapshot()["feature1"].count, 0)
+    
+    def test_numpy_scalars_are_counted(self):
+        """numpy scalars should count as numbers, bools and NaN should not"""
+        window = SlidingWindowStatistics({"x": [0, 10]})
+        for value in [np.float32(1.5), np.int64(3), 4, True, np.nan, "5"]:
+            window.add({"x": value})
+        
+        stats = window.snapshot()["x"]
+        self.assertEqual(stats.count, 3)
+        self.assertAlmostEqual(stats.mean, 8.5 / 3)
+    
+    def test_window_drift_detection(self):
+        """Drift should be detected from window statistics alone"""
+        rng = np.random.default_rng(1)
+        detector = DriftDetector(pd.DataFrame({
+            "feature1": rng.normal(0, 1, 1000),
+            "feature2": rng.normal(0, 1, 1000)
+        }))
+        window = detector.create_window(max_size=500)
+        for a, b in zip(rng.normal(3, 1, 500), rng.normal(0, 1, 500)):
+            window.add({"feature1": a, "feature2": b})
+        
+        result = detector.detect_drift_window(window)
+        
+        self.assertEqual(result["window_size"], 500)
+        self.assertIn("feature1", result["flagged_features"])
+        self.assertNotIn("feature2", result["flagged_features"])
@@ -50,3 +50,30 @@ class TestModelRegistry(unittest.TestCase):
         
         # Assert
         self.assertIsNone(result)
+    
+    @patch('mlflow.tracking.MlflowClient')
+    @patch('mlflow.set_tracking_uri')
+    def test_log_reference_profile(self, mock_set_uri, mock_client):
+        # Arrange
+        registry = ModelRegistry()
+        mock_client.return_value.get_model_version.return_value = MagicMock(run_id="run-1")
+        
+        # Act
+        artifact_path = registry.log_reference_profile("test_model", "1", "/tmp/reference_profile.bin")
+        
+        # Assert
+        mock_client.return_value.log_artifact.assert_called_with(
+            "run-1", "/tmp/reference_profile.bin", artifact_path="reference_profile"
+        )
+        self.assertEqual(artifact_path, "reference_profile/reference_profile.bin")
+    
+    @patch('mlflow.tracking.MlflowClient')
+    @patch('mlflow.set_tracking_uri')
+    def test_reference_profile_requires_run(self, mock_set_uri, mock_client):
+        # Arrange
+        registry = ModelRegistry()
+        mock_client.return_value.get_model_version.return_value = MagicMock(run_id=None)
+        
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            registry.download_reference_profile("test_model", "1", "/tmp")
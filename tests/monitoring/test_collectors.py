@@ -0,0 +1,80 @@
+# tests/monitoring/test_collectors.py
+import unittest
+from prometheus_client import CollectorRegistry
+from src.monitoring.collectors import DriftSnapshotCollector
+
+DRIFT_RESULT = {
+    "drift_detected": True,
+    "feature_drifts": {
+        "feature1": {"test": "ks_binned", "statistic": 0.4, "p_value": 0.001, "drift": True},
+        "feature3": {"test": "jensen_shannon", "statistic": 0.02, "drift": False}
+    },
+    "flagged_features": ["feature1"],
+    "window_size": 250
+}
+
+class TestDriftSnapshotCollector(unittest.TestCase):
+    
+    def setUp(self):
+        self.registry = CollectorRegistry()
+        self.collector = DriftSnapshotCollector("test_model", "1")
+        self.registry.register(self.collector)
+        self.labels = {"model_name": "test_model", "version": "1"}
+    
+    def test_exports_published_snapshot(self):
+        """A published drift result should be exported at scrape time"""
+        self.collector.update(DRIFT_RESULT)
+        
+        self.assertEqual(self.registry.get_sample_value(
+            "model_drift_score",
+            {**self.labels, "feature_name": "feature1", "drift_method": "ks_binned"}
+        ), 0.4)
+        self.assertEqual(self.registry.get_sample_value(
+            "model_drift_p_value",
+            {**self.labels, "feature_name": "feature1", "drift_method": "ks_binned"}
+        ), 0.001)
+        self.assertEqual(self.registry.get_sample_value("model_drift_flagged_features", self.labels), 1)
+        self.assertEqual(self.registry.get_sample_value("model_drift_window_size", self.labels), 250)
+    
+    def test_source_is_called_at_scrape_time(self):
+        """Drift should only be computed when metrics are collected"""
+        calls = []
+        
+        def source():
+            calls.append(1)
+            return DRIFT_RESULT
+        
+        self.collector.set_source(source)
+        self.assertEqual(calls, [])
+        
+        self.registry.get_sample_value("model_drift_window_size", self.labels)
+        self.assertEqual(len(calls), 1)
+    
+    def test_source_errors_are_counted(self):
+        """A failing drift source should not break the scrape"""
+        def source():
+            raise RuntimeError("boom")
+        
+        self.collector.set_source(source)
+        
+        self.assertEqual(self.registry.get_sample_value("model_drift_collector_errors_total", self.labels), 1)
+        self.assertIsNone(self.registry.get_sample_value("model_drift_window_size", self.labels))
+    
+    def test_individual_scores(self):
+        self.collector.set_score("feature2", 0.3, "ks_test")
+        self.assertEqual(self.registry.get_sample_value(
+            "model_drift_score",
+            {**self.labels, "feature_name": "feature2", "drift_method": "ks_test"}
+        ), 0.3)
+    
+    def test_segment_drift_is_exported_with_segment_labels(self):
+        self.collector.update_segments("region", {"eu": DRIFT_RESULT})
+        segment_labels = {**self.labels, "segment_column": "region", "segment": "eu"}
+        
+        self.assertEqual(self.registry.get_sample_value(
+            "model_segment_drift_score",
+            {**segment_labels, "feature_name": "feature1", "drift_method": "ks_binned"}
+        ), 0.4)
+        self.assertEqual(self.registry.get_sample_value(
+            "model_segment_drift_flagged_features", segment_labels
+        ), 1)
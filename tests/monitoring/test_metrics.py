@@ -0,0 +1,86 @@
+# tests/monitoring/test_metrics.py
+import unittest
+from prometheus_client import REGISTRY
+
+from src.api import main
+from src.monitoring.metrics import OVERFLOW_LABEL
+
+class TestLabelCardinalityGuard(unittest.TestCase):
+    
+    def setUp(self):
+        # Metrics register with the global registry, so reuse the API collector
+        self.metrics = main.metrics
+        self.saved = (self.metrics.max_series_per_metric,
+                      self.metrics._label_allowlist,
+                      dict(self.metrics._series))
+        self.metrics._series = {}
+        self.labels = {"model_name": self.metrics.model_name, "version": self.metrics.version}
+    
+    def tearDown(self):
+        (self.metrics.max_series_per_metric,
+         self.metrics._label_allowlist,
+         self.metrics._series) = self.saved
+    
+    def rejected(self, reason):
+        return REGISTRY.get_sample_value(
+            "model_metric_labels_rejected_total",
+            {**self.labels, "metric": "model_feature_value", "reason": reason}
+        ) or 0.0
+    
+    def feature_value(self, feature_name):
+        return REGISTRY.get_sample_value(
+            "model_feature_value", {**self.labels, "feature_name": feature_name}
+        )
+    
+    def test_unknown_features_go_to_overflow(self):
+        """Feature names outside the schema allowlist should not create series"""
+        self.metrics.set_feature_allowlist(["feature1", "feature2"])
+        before = self.rejected("not_allowed")
+        
+        self.metrics.track_feature_value("feature1", 1.5)
+        self.metrics.track_feature_value("attacker_controlled_123", 9.0)
+        
+        self.assertEqual(self.feature_value("feature1"), 1.5)
+        self.assertIsNone(self.feature_value("attacker_controlled_123"))
+        self.assertEqual(self.feature_value(OVERFLOW_LABEL), 9.0)
+        self.assertEqual(self.rejected("not_allowed") - before, 1)
+    
+    def test_series_budget_is_enforced(self):
+        """Only max_series_per_metric distinct label values should be admitted"""
+        self.metrics.set_feature_allowlist(None)
+        self.metrics.max_series_per_metric = 2
+        before = self.rejected("budget_exceeded")
+        
+        for name in ["budget_a", "budget_b", "budget_c", "budget_d", "budget_a"]:
+            self.metrics.track_feature_value(name, 1.0)
+        
+        self.assertEqual(self.metrics._series["model_feature_value"], {"budget_a", "budget_b"})
+        self.assertIsNone(self.feature_value("budget_c"))
+        self.assertEqual(self.rejected("budget_exceeded") - before, 2)
+    
+    def test_segment_export_is_capped(self):
+        """Segments over the cap should be dropped from export and counted"""
+        segments = {
+            f"segment_{i}": {"feature_drifts": {}, "flagged_features": []} for i in range(5)
+        }
+        before = REGISTRY.get_sample_value(
+            "model_metric_labels_rejected_total",
+            {**self.labels, "metric": "model_segment_drift", "reason": "segment_cap"}
+        ) or 0.0
+        
+        self.metrics.publish_segment_drift(
+            {"segment_column": "test_region", "segments": segments}, max_segments=3
+        )
+        
+        self.assertEqual(
+            list(self.metrics.drift_collector._segments["test_region"]),
+            ["segment_0", "segment_1", "segment_2"]
+        )
+        self.assertEqual(REGISTRY.get_sample_value(
+            "model_metric_labels_rejected_total",
+            {**self.labels, "metric": "model_segment_drift", "reason": "segment_cap"}
+        ) - before, 2)
+        self.metrics.drift_collector._segments = {}
+
+if __name__ == '__main__':
+    unittest.main()
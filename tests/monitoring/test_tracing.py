@@ -0,0 +1,95 @@
+# tests/monitoring/test_tracing.py
+import asyncio
+import time
+import unittest
+
+from src.monitoring.tracing import Tracer, traced, tracer
+
+class TestTracer(unittest.TestCase):
+    
+    def setUp(self):
+        self.saved = (tracer.enabled, tracer.sample_rate, tracer.slow_threshold,
+                      tracer.tail_sampling, tracer.capacity)
+        tracer.configure(enabled=True, sample_rate=1.0, slow_threshold=10.0,
+                         tail_sampling=True, capacity=10)
+        tracer.clear()
+    
+    def tearDown(self):
+        enabled, sample_rate, slow_threshold, tail_sampling, capacity = self.saved
+        tracer.configure(enabled=enabled, sample_rate=sample_rate, slow_threshold=slow_threshold,
+                         tail_sampling=tail_sampling, capacity=capacity)
+        tracer.clear()
+    
+    def test_nested_spans_are_recorded(self):
+        """Spans should nest under the span that was current when they started"""
+        @traced("inner")
+        def inner():
+            return 42
+        
+        with tracer.trace("GET /test"):
+            with tracer.span("outer", rows=3):
+                self.assertEqual(inner(), 42)
+        
+        [trace] = tracer.traces()
+        names = {span["name"]: span for span in trace["spans"]}
+        self.assertEqual(trace["kept_reason"], "sampled")
+        self.assertEqual(names["outer"]["parent_id"], names["GET /test"]["span_id"])
+        self.assertEqual(names["inner"]["parent_id"], names["outer"]["span_id"])
+        self.assertEqual(names["outer"]["attributes"], {"rows": 3})
+    
+    def test_async_functions_are_traced(self):
+        @traced("async_step")
+        async def step():
+            await asyncio.sleep(0)
+            return "done"
+        
+        async def request():
+            with tracer.trace("POST /async"):
+                return await step()
+        
+        self.assertEqual(asyncio.run(request()), "done")
+        self.assertEqual(
+            [span["name"] for span in tracer.traces()[0]["spans"]],
+            ["POST /async", "async_step"]
+        )
+    
+    def test_tail_sampling_keeps_slow_and_failed_requests(self):
+        """Unsampled requests should only be kept when slow or failed"""
+        tracer.configure(sample_rate=0.0, slow_threshold=0.01)
+        
+        with tracer.trace("fast"):
+            pass
+        with tracer.trace("slow"):
+            time.sleep(0.02)
+        with self.assertRaises(RuntimeError):
+            with tracer.trace("failed"):
+                with tracer.span("step"):
+                    raise RuntimeError("boom")
+        
+        traces = {trace["name"]: trace for trace in tracer.traces()}
+        self.assertEqual(set(traces), {"slow", "failed"})
+        self.assertEqual(traces["slow"]["kept_reason"], "slow")
+        self.assertEqual(traces["failed"]["kept_reason"], "error")
+        self.assertEqual(traces["failed"]["spans"][1]["error"], "RuntimeError")
+    
+    def test_unsampled_requests_record_nothing_without_tail_sampling(self):
+        tracer.configure(sample_rate=0.0, tail_sampling=False)
+        
+        with tracer.trace("GET /test") as span:
+            self.assertIs(tracer.span("step"), span)
+        
+        self.assertEqual(tracer.traces(), [])
+    
+    def test_ring_buffer_keeps_newest_traces(self):
+        local = Tracer(sample_rate=1.0, capacity=3)
+        for i in range(5):
+            with local.trace(f"request {i}"):
+                pass
+        
+        self.assertEqual(
+            [trace["name"] for trace in local.traces()],
+            ["request 4", "request 3", "request 2"]
+        )
+
+if __name__ == '__main__':
+    unittest.main()